@@ -0,0 +1,62 @@
+"""Optional accelerator imports with pure-Python fallbacks."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args: Any, **kwargs: Any) -> Any:
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func: Any) -> Any:
+            return func
+
+        return decorator
+
+
+def fork_is_safe() -> bool:
+    """Whether worker processes can be forked from this process.
+
+    Forking after a parallel Numba kernel has started its TBB thread pool
+    leaves the parent hanging on exit; the workqueue and OpenMP layers are
+    unaffected.
+    """
+    if not HAS_NUMBA:
+        return True
+    import numba
+
+    try:
+        return numba.threading_layer() != "tbb"
+    except ValueError:
+        # No parallel kernel has run, so no threads exist yet.
+        return True
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(payload: str | bytes) -> Any:
+    """Parse JSON with orjson when installed, else the stdlib parser.
+
+    orjson rejects the NaN/Infinity tokens that ``json.dumps`` emits for
+    missing metrics, so those payloads fall back to ``json.loads``.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(payload)
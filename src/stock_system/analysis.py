@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import multiprocessing as mp
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from ._compat import fork_is_safe
 from .backtest import summarize_backtest
 from .metrics import correlation_with_returns
 
+# backtest_results columns that only exist for storage.
+STORAGE_COLUMNS = ("id", "metrics_at_purchase", "created_at")
+
 
 def build_summary_statistics(results_df: pd.DataFrame) -> pd.DataFrame:
     if results_df.empty:
@@ -24,20 +34,57 @@ def metric_bucket_report(
     return_col: str = "return_pct",
     buckets: int = 3,
 ) -> pd.DataFrame:
+    columns = ["bucket", "avg_return", "win_rate", "count"]
     if results_df.empty or metric_col not in results_df.columns:
         return pd.DataFrame()
 
-    df = results_df[[metric_col, return_col]].dropna().copy()
+    df = results_df[[metric_col, return_col]].dropna()
     if df.empty:
         return pd.DataFrame()
 
-    df["bucket"] = pd.qcut(df[metric_col], q=buckets, duplicates="drop")
-    report = (
-        df.groupby("bucket", observed=True)[return_col]
-        .agg(avg_return="mean", win_rate=lambda x: (x > 0).mean(), count="count")
-        .reset_index()
+    values = df[metric_col].to_numpy(np.float64)
+    returns = df[return_col].to_numpy(np.float64)
+
+    # pd.qcut does the binning so the labels keep its rounded edges; the
+    # per-bucket statistics are then gathered with bincount on its codes.
+    binned = pd.qcut(values, q=buckets, duplicates="drop")
+    if not len(binned.categories):
+        # Constant values only form a bucket when a single one was requested.
+        return pd.DataFrame(columns=columns)
+    n_buckets = len(binned.categories)
+    idx = binned.codes.astype(np.intp)
+
+    counts = np.bincount(idx, minlength=n_buckets)
+    sums = np.bincount(idx, weights=returns, minlength=n_buckets)
+    wins = np.bincount(idx, weights=(returns > 0).astype(np.float64), minlength=n_buckets)
+
+    observed = counts > 0
+    return pd.DataFrame(
+        {
+            "bucket": pd.Categorical(binned.categories[observed]),
+            "avg_return": sums[observed] / counts[observed],
+            "win_rate": wins[observed] / counts[observed],
+            "count": counts[observed],
+        },
+        columns=columns,
+    )
+
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    """Write ``df`` without its index, using Arrow's C++ CSV writer when pyarrow is installed."""
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pacsv
+    except ImportError:
+        df.to_csv(path, index=False)
+        return
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pacsv.write_csv(
+        table,
+        path,
+        write_options=pacsv.WriteOptions(batch_size=65536, quoting_style="needed"),
     )
-    return report
 
 
 def export_core_reports(results_df: pd.DataFrame, output_dir: str | Path) -> dict[str, Path]:
@@ -47,70 +94,119 @@ def export_core_reports(results_df: pd.DataFrame, output_dir: str | Path) -> dic
     paths: dict[str, Path] = {}
 
     backtest_path = out / "backtest_results.csv"
-    results_df.to_csv(backtest_path, index=False)
+    _write_csv(results_df, backtest_path)
     paths["backtest_results"] = backtest_path
 
     summary = build_summary_statistics(results_df)
     summary_path = out / "summary_statistics.csv"
-    summary.to_csv(summary_path, index=False)
+    _write_csv(summary, summary_path)
     paths["summary_statistics"] = summary_path
 
-    corr = correlation_with_returns(results_df, return_col="return_pct")
+    # Storage bookkeeping (row id, raw metrics JSON, timestamp) is exported
+    # with the trades but is not a metric to correlate with returns.
+    corr = correlation_with_returns(
+        results_df.drop(columns=list(STORAGE_COLUMNS), errors="ignore"), return_col="return_pct"
+    )
     corr_path = out / "metric_correlation.csv"
-    corr.to_csv(corr_path, index=False)
+    _write_csv(corr, corr_path)
     paths["metric_correlation"] = corr_path
 
     return paths
 
 
+def _init_plot_worker() -> None:
+    plt.switch_backend("Agg")
+    sns.set_theme(style="whitegrid")
+
+
+def _save_current_figure(title: str, path: Path) -> Path:
+    plt.title(title)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+    return path
+
+
+def _plot_scatter(df: pd.DataFrame, x: str, title: str, path: Path) -> Path:
+    plt.figure(figsize=(10, 6))
+    sns.scatterplot(data=df, x=x, y="return_pct")
+    return _save_current_figure(title, path)
+
+
+def _plot_return_histogram(returns: np.ndarray, path: Path) -> Path:
+    plt.figure(figsize=(10, 6))
+    sns.histplot(returns, bins=30, kde=True)
+    plt.xlabel("return_pct")
+    return _save_current_figure("Return Distribution", path)
+
+
+def _plot_cumulative_returns(returns: np.ndarray, path: Path) -> Path:
+    plt.figure(figsize=(10, 6))
+    growth = returns / 100.0
+    growth += 1.0
+    np.cumprod(growth, out=growth)
+    plt.plot(growth)
+    plt.xlabel("Trade Number")
+    plt.ylabel("Growth of $1")
+    return _save_current_figure("Cumulative Returns", path)
+
+
 def create_core_plots(results_df: pd.DataFrame, output_dir: str | Path) -> dict[str, Path]:
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
 
-    sns.set_theme(style="whitegrid")
-    paths: dict[str, Path] = {}
+    # Each job gets only the columns it plots to keep pickling to the workers cheap.
+    jobs: dict[str, tuple[Callable[..., Path], tuple[Any, ...]]] = {}
 
     if {"revenue_growth_1y", "return_pct"}.issubset(results_df.columns):
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(data=results_df, x="revenue_growth_1y", y="return_pct")
-        plt.title("Revenue Growth vs Return")
-        p = out / "scatter_revenue_growth_vs_return.png"
-        plt.tight_layout()
-        plt.savefig(p)
-        plt.close()
-        paths["scatter_revenue_growth_vs_return"] = p
+        jobs["scatter_revenue_growth_vs_return"] = (
+            _plot_scatter,
+            (
+                results_df[["revenue_growth_1y", "return_pct"]],
+                "revenue_growth_1y",
+                "Revenue Growth vs Return",
+                out / "scatter_revenue_growth_vs_return.png",
+            ),
+        )
 
     if {"pe_ratio", "return_pct"}.issubset(results_df.columns):
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(data=results_df, x="pe_ratio", y="return_pct")
-        plt.title("P/E Ratio vs Return")
-        p = out / "scatter_pe_vs_return.png"
-        plt.tight_layout()
-        plt.savefig(p)
-        plt.close()
-        paths["scatter_pe_vs_return"] = p
+        jobs["scatter_pe_vs_return"] = (
+            _plot_scatter,
+            (
+                results_df[["pe_ratio", "return_pct"]],
+                "pe_ratio",
+                "P/E Ratio vs Return",
+                out / "scatter_pe_vs_return.png",
+            ),
+        )
 
     if "return_pct" in results_df.columns:
-        plt.figure(figsize=(10, 6))
-        sns.histplot(results_df["return_pct"].dropna(), bins=30, kde=True)
-        plt.title("Return Distribution")
-        p = out / "hist_return_distribution.png"
-        plt.tight_layout()
-        plt.savefig(p)
-        plt.close()
-        paths["hist_return_distribution"] = p
-
-        plt.figure(figsize=(10, 6))
-        sorted_df = results_df.sort_values("buy_date") if "buy_date" in results_df.columns else results_df
-        cumulative = (1 + sorted_df["return_pct"].fillna(0) / 100.0).cumprod()
-        plt.plot(cumulative.values)
-        plt.title("Cumulative Returns")
-        plt.xlabel("Trade Number")
-        plt.ylabel("Growth of $1")
-        p = out / "timeseries_cumulative_returns.png"
-        plt.tight_layout()
-        plt.savefig(p)
-        plt.close()
-        paths["timeseries_cumulative_returns"] = p
-
-    return paths
+        # Float arrays in trade order: the histogram skips missing returns,
+        # while the equity curve counts them as flat (0%) trades.
+        sorted_df = results_df.sort_values("buy_date", kind="stable") if "buy_date" in results_df.columns else results_df
+        returns = sorted_df["return_pct"].to_numpy(np.float64)
+        missing = np.isnan(returns)
+
+        jobs["hist_return_distribution"] = (
+            _plot_return_histogram,
+            (returns[~missing], out / "hist_return_distribution.png"),
+        )
+        jobs["timeseries_cumulative_returns"] = (
+            _plot_cumulative_returns,
+            (np.where(missing, 0.0, returns), out / "timeseries_cumulative_returns.png"),
+        )
+
+    if not jobs:
+        return {}
+
+    # Agg rasterization is CPU-bound and the figures are independent.
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    # Name the context explicitly: the implicit default would fix the
+    # process-wide start method and break a later mp.set_start_method().
+    method = mp.get_start_method(allow_none=True) or mp.get_all_start_methods()[0]
+    if method == "fork" and not fork_is_safe():
+        method = "forkserver"
+    ctx = mp.get_context(method)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx, initializer=_init_plot_worker) as pool:
+        futures = {key: pool.submit(func, *args) for key, (func, args) in jobs.items()}
+        return {key: future.result() for key, future in futures.items()}
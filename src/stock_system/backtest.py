@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import timedelta
-from typing import Any
 
 import numpy as np
 import pandas as pd
 from scipy import stats
 
+from ._compat import njit, prange
+
 
 @dataclass
 class BacktestConfig:
@@ -16,18 +18,124 @@ class BacktestConfig:
     filing_delay_days: int = 45
 
 
-def _normalize_prices(prices: pd.DataFrame) -> pd.DataFrame:
-    df = prices.copy()
-    df["date"] = pd.to_datetime(df["date"])
-    return df.sort_values(["ticker", "date"])
-
-
-def _price_on_or_after(ticker_prices: pd.DataFrame, target_date: pd.Timestamp) -> tuple[pd.Timestamp, float] | None:
-    subset = ticker_prices[ticker_prices["date"] >= target_date]
-    if subset.empty:
-        return None
-    row = subset.iloc[0]
-    return row["date"], float(row["close"])
+RESULT_COLUMNS = [
+    "ticker",
+    "signal_date",
+    "buy_date",
+    "sell_date",
+    "hold_days",
+    "buy_price",
+    "sell_price",
+    "return_pct",
+    "reason_exit",
+]
+
+
+_NS_PER_DAY = 86_400 * 10**9
+
+# Categories for reason_exit, indexed by the end-of-data flag.
+_EXIT_REASONS = ["time_exit", "end_of_data"]
+
+# Normalized price arrays keyed by content hash, least recently used first.
+_PRICE_CACHE: OrderedDict[str, tuple[pd.Index, np.ndarray, np.ndarray, np.ndarray]] = OrderedDict()
+_PRICE_CACHE_SIZE = 8
+
+
+def _to_ns(dates: pd.Series) -> np.ndarray:
+    return pd.to_datetime(dates).to_numpy("datetime64[ns]").view(np.int64)
+
+
+def _iso_dates(dates_ns: np.ndarray) -> np.ndarray:
+    return np.datetime_as_string(dates_ns.view("datetime64[ns]"), unit="D")
+
+
+def _normalize_prices(prices: pd.DataFrame) -> tuple[pd.Index, np.ndarray, np.ndarray, np.ndarray]:
+    """Sort prices by (ticker, date) into flat arrays grouped per ticker.
+
+    Returns ``(tickers, offsets, dates_ns, closes)``: ticker ``g`` owns rows
+    ``offsets[g]:offsets[g + 1]`` of the int64-nanosecond dates and closes.
+    Results are memoized on a hash of the frame's contents, so repeated
+    backtests over the same prices skip date parsing and sorting.
+    """
+    row_hashes = pd.util.hash_pandas_object(prices[["ticker", "date", "close"]], index=False)
+    key = hashlib.blake2b(row_hashes.to_numpy().tobytes(), digest_size=16).hexdigest()
+    cached = _PRICE_CACHE.get(key)
+    if cached is not None:
+        _PRICE_CACHE.move_to_end(key)
+        return cached
+
+    normalized = _build_price_arrays(prices)
+    for arr in normalized[1:]:
+        arr.flags.writeable = False
+    _PRICE_CACHE[key] = normalized
+    if len(_PRICE_CACHE) > _PRICE_CACHE_SIZE:
+        _PRICE_CACHE.popitem(last=False)
+    return normalized
+
+
+def _build_price_arrays(prices: pd.DataFrame) -> tuple[pd.Index, np.ndarray, np.ndarray, np.ndarray]:
+    # Categorical codes are reused as-is when the caller already passes a category column.
+    ticker_col = prices["ticker"].astype("category")
+    tickers = ticker_col.cat.categories
+    codes = ticker_col.cat.codes.to_numpy(np.intp)
+    dates = _to_ns(prices["date"])
+    closes = prices["close"].to_numpy(np.float64)
+
+    valid = codes >= 0
+    codes, dates, closes = codes[valid], dates[valid], closes[valid]
+    order = np.lexsort((dates, codes))
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(tickers)))))
+    return tickers, offsets, dates[order], closes[order]
+
+
+def _searchsorted_groups(
+    values: np.ndarray,
+    offsets: np.ndarray,
+    groups: np.ndarray,
+    targets: np.ndarray,
+) -> np.ndarray:
+    """Vectorized ``np.searchsorted(values[offsets[g]:offsets[g + 1]], t, side="left")``.
+
+    Runs one binary search per (group, target) pair in lockstep and returns
+    absolute positions into ``values``. A result equal to ``offsets[g + 1]``
+    means no value in the group is >= the target.
+    """
+    lo = offsets[groups]
+    hi = offsets[groups + 1]
+    while True:
+        active = lo < hi
+        if not active.any():
+            return lo
+        mid = (lo + hi) // 2
+        below = values[np.where(active, mid, 0)] < targets
+        lo = np.where(active & below, mid + 1, lo)
+        hi = np.where(active & ~below, mid, hi)
+
+
+@njit(parallel=True, cache=True)
+def _select_non_overlapping(
+    offsets: np.ndarray,
+    signal_dates: np.ndarray,
+    sell_dates: np.ndarray,
+) -> np.ndarray:
+    """Return a mask of signals taken while no position in the same ticker is open.
+
+    Signals are grouped by ticker (CSR layout: ticker ``g`` owns rows
+    ``offsets[g]:offsets[g + 1]``) and ordered by signal date within each group.
+    Dates are int64 nanoseconds. Tickers are independent, so groups run in
+    parallel; within a group the scan is sequential.
+    """
+    keep = np.zeros(signal_dates.shape[0], dtype=np.bool_)
+    for g in prange(offsets.shape[0] - 1):
+        holding = False
+        active_until = 0
+        for i in range(offsets[g], offsets[g + 1]):
+            if holding and signal_dates[i] < active_until:
+                continue
+            keep[i] = True
+            holding = True
+            active_until = sell_dates[i]
+    return keep
 
 
 def backtest_strategy(
@@ -38,83 +146,70 @@ def backtest_strategy(
     config = config or BacktestConfig()
 
     if screen_results.empty or prices.empty:
-        return pd.DataFrame(
-            columns=[
-                "ticker",
-                "signal_date",
-                "buy_date",
-                "sell_date",
-                "hold_days",
-                "buy_price",
-                "sell_price",
-                "return_pct",
-                "reason_exit",
-            ]
-        )
-
-    price_df = _normalize_prices(prices)
-    screen_df = screen_results.copy()
-    screen_df["date_screened"] = pd.to_datetime(screen_df["date_screened"])
-    screen_df = screen_df.sort_values("date_screened")
-
-    # Track the sell date of the most recent position per ticker to prevent overlaps.
-    active_until: dict[str, pd.Timestamp] = {}
-
-    rows: list[dict[str, Any]] = []
-    for _, signal in screen_df.iterrows():
-        if not bool(signal.get("passes_screen", True)):
-            continue
-
-        ticker = signal["ticker"]
-
-        # Skip if we already hold a position in this ticker.
-        if ticker in active_until and signal["date_screened"] < active_until[ticker]:
-            continue
-
-        ticker_prices = price_df[price_df["ticker"] == ticker]
-        if ticker_prices.empty:
-            continue
-
-        # Delay buy to account for filing lag (avoids look-ahead bias).
-        earliest_buy = signal["date_screened"] + timedelta(days=config.filing_delay_days)
-        buy_result = _price_on_or_after(ticker_prices, earliest_buy)
-        if buy_result is None:
-            continue
-
-        buy_date, buy_price = buy_result
-        target_sell_date = buy_date + timedelta(days=config.hold_days)
-        sell_result = _price_on_or_after(ticker_prices, target_sell_date)
-
-        if sell_result is None:
-            sell_row = ticker_prices.iloc[-1]
-            sell_date = pd.to_datetime(sell_row["date"])
-            sell_price = float(sell_row["close"])
-            reason_exit = "end_of_data"
-        else:
-            sell_date, sell_price = sell_result
-            reason_exit = "time_exit"
-
-        active_until[ticker] = sell_date
-
-        gross_return = (sell_price - buy_price) / buy_price
-        total_cost = 2 * config.transaction_cost_bps / 10000.0
-        net_return = gross_return - total_cost
-
-        rows.append(
-            {
-                "ticker": ticker,
-                "signal_date": signal["date_screened"].date().isoformat(),
-                "buy_date": buy_date.date().isoformat(),
-                "sell_date": sell_date.date().isoformat(),
-                "hold_days": (sell_date - buy_date).days,
-                "buy_price": buy_price,
-                "sell_price": sell_price,
-                "return_pct": net_return * 100,
-                "reason_exit": reason_exit,
-            }
-        )
-
-    return pd.DataFrame(rows)
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    tickers, offsets, price_dates, closes = _normalize_prices(prices)
+
+    signals = screen_results
+    if "passes_screen" in signals.columns:
+        signals = signals[signals["passes_screen"].astype(bool).to_numpy()]
+    groups = pd.Categorical(signals["ticker"], categories=tickers).codes.astype(np.intp)
+    has_prices = groups >= 0
+    groups = groups[has_prices]
+    signal_dates = _to_ns(signals["date_screened"])[has_prices]
+
+    # Delay buy to account for filing lag (avoids look-ahead bias).
+    buy_targets = signal_dates + config.filing_delay_days * _NS_PER_DAY
+    buy_idx = _searchsorted_groups(price_dates, offsets, groups, buy_targets)
+    can_buy = buy_idx < offsets[groups + 1]
+    groups, signal_dates, buy_idx = groups[can_buy], signal_dates[can_buy], buy_idx[can_buy]
+
+    sell_targets = price_dates[buy_idx] + config.hold_days * _NS_PER_DAY
+    sell_idx = _searchsorted_groups(price_dates, offsets, groups, sell_targets)
+
+    # No price on or after the target sell date: exit on the last available close.
+    group_end = offsets[groups + 1]
+    end_of_data = sell_idx == group_end
+    sell_idx = np.where(end_of_data, group_end - 1, sell_idx)
+
+    # Skip signals that fire while a position in the same ticker is still open.
+    order = np.lexsort((signal_dates, groups))
+    signal_offsets = np.concatenate(([0], np.cumsum(np.bincount(groups, minlength=len(tickers)))))
+    keep = np.zeros(len(order), dtype=bool)
+    keep[order] = _select_non_overlapping(
+        signal_offsets,
+        signal_dates[order],
+        price_dates[sell_idx[order]],
+    )
+    taken = np.flatnonzero(keep)
+    taken = taken[np.argsort(signal_dates[taken], kind="stable")]
+
+    buy_idx, sell_idx = buy_idx[taken], sell_idx[taken]
+    buy_price = closes[buy_idx]
+    sell_price = closes[sell_idx]
+    total_cost = 2 * config.transaction_cost_bps / 10000.0
+    # ((sell - buy) / buy - cost) * 100, evaluated in one output buffer.
+    return_pct = np.subtract(sell_price, buy_price)
+    return_pct /= buy_price
+    return_pct -= total_cost
+    return_pct *= 100
+
+    # Tickers and exit reasons repeat heavily, so keep them as categorical
+    # codes instead of materializing one string object per trade.
+    return pd.DataFrame(
+        {
+            "ticker": pd.Categorical.from_codes(groups[taken], categories=tickers),
+            "signal_date": _iso_dates(signal_dates[taken]),
+            "buy_date": _iso_dates(price_dates[buy_idx]),
+            "sell_date": _iso_dates(price_dates[sell_idx]),
+            "hold_days": ((price_dates[sell_idx] - price_dates[buy_idx]) // _NS_PER_DAY).astype(np.int32),
+            "buy_price": buy_price,
+            "sell_price": sell_price,
+            "return_pct": return_pct,
+            "reason_exit": pd.Categorical.from_codes(end_of_data[taken].astype(np.int8), categories=_EXIT_REASONS),
+        },
+        columns=RESULT_COLUMNS,
+    )
 
 
 def summarize_backtest(results: pd.DataFrame) -> dict[str, float | int | None]:
@@ -131,34 +226,41 @@ def summarize_backtest(results: pd.DataFrame) -> dict[str, float | int | None]:
             "win_rate_p_value": None,
         }
 
-    sorted_results = results.sort_values("buy_date").reset_index(drop=True)
-    r = sorted_results["return_pct"].astype(float)
-    win_rate = float((r > 0).mean())
-
-    equity = (1 + r / 100.0).cumprod()
-    running_max = equity.cummax()
-    drawdowns = equity / running_max - 1
+    order = np.argsort(results["buy_date"].to_numpy(), kind="stable")
+    r = results["return_pct"].to_numpy(np.float64)[order]
+    n = len(r)
+    wins = int(np.count_nonzero(r > 0))
+    win_rate = wins / n
+    # Trades without a return still count towards num_trades and the win-rate
+    # denominator but are skipped by the return statistics.
+    r = r[~np.isnan(r)]
+    if not len(r):
+        r = np.array([np.nan])
+
+    equity = np.cumprod(1 + r / 100.0)
+    drawdowns = equity / np.maximum.accumulate(equity) - 1
     max_drawdown = float(drawdowns.min())
 
     # CAGR based on actual calendar time between first buy and last sell.
-    first_buy = pd.to_datetime(sorted_results["buy_date"]).min()
-    last_sell = pd.to_datetime(sorted_results["sell_date"]).max()
+    first_buy = pd.to_datetime(results["buy_date"]).min()
+    last_sell = pd.to_datetime(results["sell_date"]).max()
     total_days = (last_sell - first_buy).days
     years = total_days / 365.25 if total_days > 0 else 1.0
-    cagr = float(equity.iloc[-1] ** (1.0 / years) - 1)
+    cagr = float(equity[-1] ** (1.0 / years) - 1)
 
     excess = r / 100.0
     sharpe = None
-    if excess.std(ddof=1) > 0:
+    std = float(excess.std(ddof=1)) if len(r) > 1 else 0.0
+    if std > 0:
         # Annualize using actual trade frequency, not a fixed 252 daily assumption.
-        trades_per_year = len(r) / years if years > 0 else len(r)
-        sharpe = float((excess.mean() / excess.std(ddof=1)) * np.sqrt(trades_per_year))
+        trades_per_year = n / years if years > 0 else n
+        sharpe = float((excess.mean() / std) * np.sqrt(trades_per_year))
 
-    wins = int((r > 0).sum())
-    binom = stats.binomtest(wins, len(r), p=0.5, alternative="greater")
+    # One-sided binomial test of win rate > 50%: P(X >= wins).
+    p_value = stats.binom.sf(wins - 1, n, 0.5)
 
     return {
-        "num_trades": int(len(r)),
+        "num_trades": n,
         "avg_return_pct": float(r.mean()),
         "win_rate": win_rate,
         "best_trade_pct": float(r.max()),
@@ -166,5 +268,5 @@ def summarize_backtest(results: pd.DataFrame) -> dict[str, float | int | None]:
         "sharpe_ratio": sharpe,
         "max_drawdown_pct": max_drawdown * 100,
         "cagr": cagr,
-        "win_rate_p_value": float(binom.pvalue),
+        "win_rate_p_value": float(p_value),
     }
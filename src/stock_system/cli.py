@@ -1,20 +1,37 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 from pathlib import Path
 
-import pandas as pd
-
+from ._compat import json_loads
 from .analysis import create_core_plots, export_core_reports
 from .backtest import BacktestConfig, backtest_strategy, summarize_backtest
 from .db import Database
-from .fetchers import FMPConfig, FMPFetcher, YFinanceFetcher
+from .fetchers import FileCache, FMPConfig, FMPFetcher, YFinanceFetcher
 from .metrics import add_growth_windows, add_revenue_acceleration
 from .screening import ScreeningCriteria, screen_universe
 
 
+# Trade fields stored as backtest_results columns; everything else in the
+# merged frame is a screening metric saved under metrics_at_purchase.
+BACKTEST_CORE_COLUMNS = [
+    "ticker",
+    "buy_date",
+    "sell_date",
+    "hold_days",
+    "buy_price",
+    "sell_price",
+    "return_pct",
+    "reason_exit",
+]
+BACKTEST_RESERVED_COLUMNS = frozenset([*BACKTEST_CORE_COLUMNS, "signal_date", "date_screened"])
+
+# How long --cache-dir responses are reused; fundamentals change quarterly.
+PRICE_CACHE_TTL_SECONDS = 7 * 86400
+FUNDAMENTALS_CACHE_TTL_SECONDS = 90 * 86400
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Stock screening and backtesting system")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -27,11 +44,13 @@ def parse_args() -> argparse.Namespace:
     p_prices.add_argument("--tickers", nargs="+", required=True)
     p_prices.add_argument("--start", required=True)
     p_prices.add_argument("--end", required=True)
+    p_prices.add_argument("--cache-dir", help="Reuse fetched responses stored in this directory")
 
     p_fund = sub.add_parser("fetch-fundamentals", help="Fetch fundamentals from yfinance or FMP")
     p_fund.add_argument("--db-path", required=True)
     p_fund.add_argument("--tickers", nargs="+", required=True)
     p_fund.add_argument("--source", choices=["yfinance", "fmp"], default="yfinance")
+    p_fund.add_argument("--cache-dir", help="Reuse fetched responses stored in this directory")
 
     p_screen = sub.add_parser("screen", help="Run screening on latest financial rows")
     p_screen.add_argument("--db-path", required=True)
@@ -58,15 +77,23 @@ def cmd_init_db(db: Database) -> None:
     print(f"Initialized DB schema: {db.db_path}")
 
 
-def cmd_fetch_prices(db: Database, tickers: list[str], start: str, end: str) -> None:
-    fetcher = YFinanceFetcher()
+def cmd_fetch_prices(
+    db: Database,
+    tickers: list[str],
+    start: str,
+    end: str,
+    cache_dir: str | None = None,
+) -> None:
+    cache = FileCache(cache_dir, ttl_seconds=PRICE_CACHE_TTL_SECONDS) if cache_dir else None
+    fetcher = YFinanceFetcher(cache=cache)
+    all_prices = fetcher.fetch_prices_many(tickers, start=start, end=end)
     total_rows = 0
     for ticker in tickers:
         profile = fetcher.fetch_company_profile(ticker)
-        db.upsert_companies([profile])
-
-        prices = fetcher.fetch_prices(ticker, start=start, end=end)
-        db.upsert_stock_prices(prices.to_dict(orient="records"))
+        prices = all_prices[ticker]
+        with db.bulk():
+            db.upsert_companies([profile])
+            db.upsert_stock_prices_df(prices)
         total_rows += len(prices)
         print(f"{ticker}: inserted/updated {len(prices)} price rows")
 
@@ -78,21 +105,23 @@ def cmd_fetch_fundamentals(
     tickers: list[str],
     source: str,
     fmp_api_key: str | None,
+    cache_dir: str | None = None,
 ) -> None:
+    cache = FileCache(cache_dir, ttl_seconds=FUNDAMENTALS_CACHE_TTL_SECONDS) if cache_dir else None
     if source == "yfinance":
-        fetcher = YFinanceFetcher()
+        fetcher = YFinanceFetcher(cache=cache)
     else:
         if not fmp_api_key:
             raise ValueError("FMP API key required for source=fmp")
-        fetcher = FMPFetcher(FMPConfig(api_key=fmp_api_key))
+        fetcher = FMPFetcher(FMPConfig(api_key=fmp_api_key), cache=cache)
 
     total_rows = 0
     for ticker in tickers:
         profile = fetcher.fetch_company_profile(ticker)
-        db.upsert_companies([profile])
-
         records = fetcher.fetch_fundamentals(ticker)
-        db.upsert_financial_metrics(records)
+        with db.bulk():
+            db.upsert_companies([profile])
+            db.upsert_financial_metrics(records)
         total_rows += len(records)
         print(f"{ticker}: inserted/updated {len(records)} fundamental rows")
 
@@ -151,9 +180,16 @@ def cmd_backtest(
         print("No screening signals found for backtest")
         return
 
-    metrics_expanded = signals["metrics_json"].apply(lambda s: json.loads(s) if s else {})
-    metrics_df = pd.json_normalize(metrics_expanded)
-    signals = pd.concat([signals.drop(columns=["metrics_json"]), metrics_df], axis=1)
+    # Screening metrics are flat dicts, so build one column per key directly
+    # (in first-seen key order) instead of probing shapes with json_normalize.
+    # Keys named like a signal column are skipped so they cannot overwrite it.
+    metrics_expanded = [json_loads(s) if s else {} for s in signals["metrics_json"].to_numpy()]
+    signals = signals.drop(columns=["metrics_json"])
+    metric_keys = [
+        k for k in dict.fromkeys(k for m in metrics_expanded for k in m) if k not in signals.columns
+    ]
+    metric_columns = {k: [m.get(k) for m in metrics_expanded] for k in metric_keys}
+    signals = signals.assign(**metric_columns)
 
     tickers = signals["ticker"].unique().tolist()
     placeholders = ",".join("?" for _ in tickers)
@@ -175,10 +211,9 @@ def cmd_backtest(
         print("No backtest trades generated")
         return
 
-    if not metrics_df.empty:
-        metrics_cols = [c for c in metrics_df.columns if c in signals.columns]
+    if metric_keys:
         merged = results.merge(
-            signals[["ticker", "date_screened", *metrics_cols]],
+            signals[["ticker", "date_screened", *metric_keys]],
             left_on=["ticker", "signal_date"],
             right_on=["ticker", "date_screened"],
             how="left",
@@ -186,38 +221,13 @@ def cmd_backtest(
     else:
         merged = results
 
-    db_rows = []
-    for _, row in merged.iterrows():
-        metrics = {
-            k: row[k]
-            for k in merged.columns
-            if k
-            not in {
-                "ticker",
-                "buy_date",
-                "sell_date",
-                "hold_days",
-                "buy_price",
-                "sell_price",
-                "return_pct",
-                "reason_exit",
-                "signal_date",
-                "date_screened",
-            }
-        }
-        db_rows.append(
-            {
-                "ticker": row["ticker"],
-                "buy_date": row["buy_date"],
-                "sell_date": row["sell_date"],
-                "hold_days": row["hold_days"],
-                "buy_price": row["buy_price"],
-                "sell_price": row["sell_price"],
-                "return_pct": row["return_pct"],
-                "reason_exit": row.get("reason_exit"),
-                "metrics_at_purchase": metrics,
-            }
-        )
+    metric_cols = [c for c in merged.columns if c not in BACKTEST_RESERVED_COLUMNS]
+    core_rows = merged[BACKTEST_CORE_COLUMNS].to_dict(orient="records")
+    if metric_cols:
+        metric_rows = merged[metric_cols].to_dict(orient="records")
+    else:
+        metric_rows = [{} for _ in core_rows]
+    db_rows = [{**core, "metrics_at_purchase": metrics} for core, metrics in zip(core_rows, metric_rows)]
 
     db.upsert_backtest_results(db_rows)
     summary = summarize_backtest(results)
@@ -227,6 +237,8 @@ def cmd_backtest(
 
 
 def cmd_analyze(db: Database, output_dir: str) -> None:
+    # Every stored column is kept for the CSV export; the metrics the plots
+    # use are unpacked in SQL.
     q = """
     SELECT br.*, json_extract(br.metrics_at_purchase, '$.revenue_growth_1y') AS revenue_growth_1y,
            json_extract(br.metrics_at_purchase, '$.pe_ratio') AS pe_ratio
@@ -257,9 +269,9 @@ def main() -> None:
     if args.command == "init-db":
         cmd_init_db(db)
     elif args.command == "fetch-prices":
-        cmd_fetch_prices(db, args.tickers, args.start, args.end)
+        cmd_fetch_prices(db, args.tickers, args.start, args.end, args.cache_dir)
     elif args.command == "fetch-fundamentals":
-        cmd_fetch_fundamentals(db, args.tickers, args.source, os.getenv("FMP_API_KEY"))
+        cmd_fetch_fundamentals(db, args.tickers, args.source, os.getenv("FMP_API_KEY"), args.cache_dir)
     elif args.command == "screen":
         cmd_screen(db, args.as_of)
     elif args.command == "backtest":
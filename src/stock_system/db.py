@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
@@ -90,29 +92,96 @@ CREATE TABLE IF NOT EXISTS backtest_results (
 CREATE INDEX IF NOT EXISTS idx_financial_metrics_ticker_period
     ON financial_metrics(ticker, period_end);
 
-CREATE INDEX IF NOT EXISTS idx_stock_prices_ticker_date
-    ON stock_prices(ticker, date);
+-- Covers the backtest price load (ticker, date, close by ticker) without
+-- touching the table. UNIQUE(ticker, date) already indexes (ticker, date),
+-- so the older index on just those columns is redundant.
+DROP INDEX IF EXISTS idx_stock_prices_ticker_date;
+
+CREATE INDEX IF NOT EXISTS idx_stock_prices_ticker_date_close
+    ON stock_prices(ticker, date, close);
 
 CREATE INDEX IF NOT EXISTS idx_screening_results_date
     ON screening_results(date_screened);
 """
 
 
+STOCK_PRICE_COLUMNS = ["ticker", "date", "open", "high", "low", "close", "adj_close", "volume", "market_cap"]
+
+UPSERT_STOCK_PRICES_SQL = """
+INSERT INTO stock_prices (
+    ticker, date, open, high, low, close, adj_close, volume, market_cap
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(ticker, date) DO UPDATE SET
+    open=excluded.open,
+    high=excluded.high,
+    low=excluded.low,
+    close=excluded.close,
+    adj_close=excluded.adj_close,
+    volume=excluded.volume,
+    market_cap=excluded.market_cap
+"""
+
+
 class Database:
     def __init__(self, db_path: str | Path) -> None:
         self.db_path = str(db_path)
+        self._bulk_conn: sqlite3.Connection | None = None
 
     def connect(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -65536")
         return conn
 
+    @contextmanager
+    def bulk(self) -> Iterator[sqlite3.Connection]:
+        """Run all upserts inside the block on one connection and one transaction.
+
+        The transaction commits when the block exits and rolls back if it raises.
+        Nested calls reuse the outer transaction.
+        """
+        if self._bulk_conn is not None:
+            yield self._bulk_conn
+            return
+
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        self._bulk_conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._bulk_conn = None
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        if self._bulk_conn is not None:
+            yield self._bulk_conn
+            return
+
+        conn = self.connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
     def initialize(self) -> None:
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-        with self.connect() as conn:
+        conn = self.connect()
+        try:
             conn.executescript(SCHEMA_SQL)
             conn.commit()
+        finally:
+            conn.close()
 
     def upsert_companies(self, companies: list[dict[str, Any]]) -> None:
         if not companies:
@@ -135,9 +204,8 @@ class Database:
             )
             for c in companies
         ]
-        with self.connect() as conn:
+        with self._transaction() as conn:
             conn.executemany(sql, rows)
-            conn.commit()
 
     def upsert_financial_metrics(self, records: list[dict[str, Any]]) -> None:
         if not records:
@@ -200,26 +268,12 @@ class Database:
                     json.dumps(r.get("raw_payload", {})),
                 )
             )
-        with self.connect() as conn:
+        with self._transaction() as conn:
             conn.executemany(sql, rows)
-            conn.commit()
 
     def upsert_stock_prices(self, records: list[dict[str, Any]]) -> None:
         if not records:
             return
-        sql = """
-        INSERT INTO stock_prices (
-            ticker, date, open, high, low, close, adj_close, volume, market_cap
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(ticker, date) DO UPDATE SET
-            open=excluded.open,
-            high=excluded.high,
-            low=excluded.low,
-            close=excluded.close,
-            adj_close=excluded.adj_close,
-            volume=excluded.volume,
-            market_cap=excluded.market_cap
-        """
         rows = []
         for r in records:
             ticker = r.get("ticker")
@@ -241,9 +295,23 @@ class Database:
             )
         if not rows:
             return
-        with self.connect() as conn:
-            conn.executemany(sql, rows)
-            conn.commit()
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_STOCK_PRICES_SQL, rows)
+
+    def upsert_stock_prices_df(self, prices: pd.DataFrame) -> None:
+        """Upsert a price frame straight from its columns.
+
+        Missing price columns are stored as NULL and rows without a ticker
+        or date are skipped, as in ``upsert_stock_prices``. Dates must
+        already be ISO strings.
+        """
+        if prices.empty:
+            return
+        df = prices.reindex(columns=STOCK_PRICE_COLUMNS).dropna(subset=["ticker", "date"])
+        if df.empty:
+            return
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_STOCK_PRICES_SQL, df.itertuples(index=False, name=None))
 
     def upsert_screening_results(self, records: list[dict[str, Any]]) -> None:
         if not records:
@@ -269,9 +337,8 @@ class Database:
             )
             for r in records
         ]
-        with self.connect() as conn:
+        with self._transaction() as conn:
             conn.executemany(sql, rows)
-            conn.commit()
 
     def upsert_backtest_results(self, records: list[dict[str, Any]]) -> None:
         if not records:
@@ -302,10 +369,31 @@ class Database:
             )
             for r in records
         ]
-        with self.connect() as conn:
+        with self._transaction() as conn:
             conn.executemany(sql, rows)
-            conn.commit()
 
     def query_df(self, query: str, params: tuple[Any, ...] = ()) -> pd.DataFrame:
-        with self.connect() as conn:
+        """Run ``query`` and return the rows as a DataFrame.
+
+        With ``adbc_driver_sqlite`` installed the result is fetched as one
+        Arrow table instead of row by row through Python objects. Inside
+        ``bulk()`` the shared sqlite3 connection is used so uncommitted
+        writes stay visible.
+        """
+        if self._bulk_conn is None:
+            try:
+                import adbc_driver_sqlite.dbapi as adbc
+            except ImportError:
+                pass
+            else:
+                with adbc.connect(self.db_path) as conn, conn.cursor() as cur:
+                    cur.execute(query, params)
+                    table = cur.fetch_arrow_table()
+                # Empty results have no rows to infer types from; match the
+                # untyped columns read_sql_query returns.
+                if table.num_rows == 0:
+                    return pd.DataFrame(columns=table.column_names)
+                return table.to_pandas()
+
+        with self._transaction() as conn:
             return pd.read_sql_query(query, conn, params=params)
@@ -1,10 +1,34 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
-import requests
+
+
+# Statement fields FMPFetcher.fetch_fundamentals reads as numbers.
+FMP_NUMERIC_FIELDS = [
+    "revenue",
+    "netIncome",
+    "grossProfit",
+    "operatingIncome",
+    "operatingCashFlow",
+    "freeCashFlow",
+    "totalStockholdersEquity",
+    "totalDebt",
+    "totalCurrentAssets",
+    "totalCurrentLiabilities",
+    "totalAssets",
+    "eps",
+]
 
 
 @dataclass
@@ -13,74 +37,136 @@ class FMPConfig:
     base_url: str = "https://financialmodelingprep.com/api/v3"
 
 
+class FileCache:
+    """JSON payloads on disk keyed by request, served until ``ttl_seconds`` old.
+
+    Keys are hashed into file names under ``directory``
+    (``~/.cache/stock_system`` by default). ``None`` marks a miss, so null
+    payloads are never cached; the fetchers also skip empty results, which
+    usually mean a failed request rather than a ticker without data.
+    """
+
+    def __init__(self, directory: str | Path | None = None, ttl_seconds: float = 7 * 86400) -> None:
+        self.directory = Path(directory) if directory else Path.home() / ".cache" / "stock_system"
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, key: tuple[Any, ...]) -> Path:
+        raw = json.dumps(key, sort_keys=True, default=str).encode()
+        return self.directory / f"{hashlib.blake2b(raw, digest_size=16).hexdigest()}.json"
+
+    def get(self, *key: Any) -> Any:
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def set(self, value: Any, *key: Any) -> None:
+        if value is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial file.
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(value))
+        os.replace(tmp, path)
+
+
 class YFinanceFetcher:
-    def __init__(self) -> None:
+    def __init__(self, cache: FileCache | None = None) -> None:
         try:
             import yfinance as yf
         except ImportError as exc:
             raise ImportError("yfinance is required for YFinanceFetcher") from exc
         self.yf = yf
+        self.cache = cache
+        # yfinance caches .info and the statements on each Ticker object, so
+        # reusing one per symbol lets profile and fundamentals share requests.
+        self._ticker = functools.lru_cache(maxsize=512)(yf.Ticker)
 
     def fetch_prices(self, ticker: str, start: str, end: str) -> pd.DataFrame:
-        data = self.yf.download(ticker, start=start, end=end, auto_adjust=False, progress=False)
-        if data.empty:
-            return pd.DataFrame(columns=["ticker", "date", "open", "high", "low", "close", "adj_close", "volume"])
-
-        # yfinance may return MultiIndex columns depending on version/options.
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = [
-                str(col[0]) if isinstance(col, tuple) else str(col)
-                for col in data.columns.to_flat_index()
-            ]
-
-        data = data.reset_index()
-        data.columns = [str(c).strip() for c in data.columns]
-        rename_map = {
-            "Date": "date",
-            "date": "date",
-            "Open": "open",
-            "open": "open",
-            "High": "high",
-            "high": "high",
-            "Low": "low",
-            "low": "low",
-            "Close": "close",
-            "close": "close",
-            "Adj Close": "adj_close",
-            "adj close": "adj_close",
-            "Adj_Close": "adj_close",
-            "adj_close": "adj_close",
-            "Volume": "volume",
-            "volume": "volume",
+        return self.fetch_prices_many([ticker], start, end)[ticker]
+
+    def fetch_prices_many(self, tickers: list[str], start: str, end: str) -> dict[str, pd.DataFrame]:
+        """Prices per ticker, downloading every uncached ticker in one batch.
+
+        yfinance fetches the symbols of a multi-ticker download concurrently,
+        so a universe backfill is not one round trip per ticker.
+        """
+        prices: dict[str, pd.DataFrame] = {}
+        missing: list[str] = []
+        for ticker in dict.fromkeys(tickers):
+            cached = self.cache.get("yfinance", "prices", ticker, start, end) if self.cache is not None else None
+            if cached is not None:
+                prices[ticker] = pd.DataFrame(cached)
+            else:
+                missing.append(ticker)
+
+        for ticker, frame in self._download_prices(missing, start, end).items():
+            prices[ticker] = frame
+            # An empty frame is usually a failed or rate-limited download, so
+            # it is retried next time rather than cached for the whole TTL.
+            if self.cache is not None and not frame.empty:
+                self.cache.set(frame.to_dict(orient="list"), "yfinance", "prices", ticker, start, end)
+        return prices
+
+    def _download_prices(self, tickers: list[str], start: str, end: str) -> dict[str, pd.DataFrame]:
+        if not tickers:
+            return {}
+        if len(tickers) == 1:
+            data = self.yf.download(tickers[0], start=start, end=end, auto_adjust=False, progress=False)
+            return {tickers[0]: _price_frame(data, tickers[0])}
+
+        # yfinance labels the batch's column blocks with upper-case symbols,
+        # so look tickers up that way and key the results by the caller's spelling.
+        symbols = {ticker: ticker.upper() for ticker in tickers}
+        data = self.yf.download(
+            list(dict.fromkeys(symbols.values())),
+            start=start,
+            end=end,
+            auto_adjust=False,
+            progress=False,
+            group_by="ticker",
+        )
+        # The batch shares one date index, so a ticker's block is all-NaN on
+        # dates it has no rows for; failed tickers are missing entirely.
+        available = set(data.columns.get_level_values(0)) if isinstance(data.columns, pd.MultiIndex) else set()
+        return {
+            ticker: _price_frame(data[symbol].dropna(how="all") if symbol in available else pd.DataFrame(), ticker)
+            for ticker, symbol in symbols.items()
         }
-        data = data.rename(columns=rename_map)
-
-        # Ensure expected columns exist so downstream insert is stable.
-        for col in ["open", "high", "low", "close", "adj_close", "volume"]:
-            if col not in data.columns:
-                data[col] = None
-
-        if "date" not in data.columns:
-            raise ValueError(f"Could not parse date column for ticker={ticker}")
-
-        data["ticker"] = ticker
-        data["date"] = pd.to_datetime(data["date"]).dt.date.astype(str)
-        cols = ["ticker", "date", "open", "high", "low", "close", "adj_close", "volume"]
-        out = data[cols].copy()
-        out = out.dropna(subset=["ticker", "date"])
-        return out
 
     def fetch_company_profile(self, ticker: str) -> dict[str, Any]:
-        info = self.yf.Ticker(ticker).info
-        return {
+        if self.cache is not None:
+            cached = self.cache.get("yfinance", "profile", ticker)
+            if cached is not None:
+                return cached
+        info = self._ticker(ticker).info
+        profile = {
             "ticker": ticker,
             "name": info.get("longName") or info.get("shortName"),
             "sector": info.get("sector"),
             "industry": info.get("industry"),
         }
+        if self.cache is not None:
+            self.cache.set(profile, "yfinance", "profile", ticker)
+        return profile
 
     def fetch_fundamentals(self, ticker: str) -> list[dict[str, Any]]:
-        tk = self.yf.Ticker(ticker)
+        if self.cache is None:
+            return self._fetch_fundamentals(ticker)
+        cached = self.cache.get("yfinance", "fundamentals", ticker)
+        if cached is not None:
+            return cached
+        records = self._fetch_fundamentals(ticker)
+        if records:
+            self.cache.set(records, "yfinance", "fundamentals", ticker)
+        return records
+
+    def _fetch_fundamentals(self, ticker: str) -> list[dict[str, Any]]:
+        tk = self._ticker(ticker)
         financials = tk.financials.T
         cashflow = tk.cashflow.T
         balance = tk.balance_sheet.T
@@ -88,68 +174,63 @@ class YFinanceFetcher:
         if financials.empty:
             return []
 
-        records: list[dict[str, Any]] = []
-        for idx, row in financials.iterrows():
-            period_end = pd.to_datetime(idx).date().isoformat()
-            cf = cashflow.loc[idx] if idx in cashflow.index else pd.Series(dtype=float)
-            bs = balance.loc[idx] if idx in balance.index else pd.Series(dtype=float)
-
-            revenue = row.get("Total Revenue")
-            net_income = row.get("Net Income")
-            gross_profit = row.get("Gross Profit")
-            operating_income = row.get("Operating Income")
-            operating_cash_flow = cf.get("Operating Cash Flow")
-            free_cash_flow = cf.get("Free Cash Flow")
-            total_assets = bs.get("Total Assets")
-            total_debt = bs.get("Total Debt")
-            shareholder_equity = bs.get("Stockholders Equity")
-            current_assets = bs.get("Current Assets")
-            current_liabilities = bs.get("Current Liabilities")
-
-            current_ratio = None
-            if pd.notna(current_assets) and pd.notna(current_liabilities) and current_liabilities:
-                current_ratio = float(current_assets / current_liabilities)
-
-            gross_margin = float(gross_profit / revenue) if pd.notna(gross_profit) and pd.notna(revenue) and revenue else None
-            operating_margin = (
-                float(operating_income / revenue)
-                if pd.notna(operating_income) and pd.notna(revenue) and revenue
-                else None
-            )
-            net_margin = float(net_income / revenue) if pd.notna(net_income) and pd.notna(revenue) and revenue else None
-            roe = (
-                float(net_income / shareholder_equity)
-                if pd.notna(net_income) and pd.notna(shareholder_equity) and shareholder_equity
-                else None
-            )
-            debt_to_equity = (
-                float(total_debt / shareholder_equity)
-                if pd.notna(total_debt) and pd.notna(shareholder_equity) and shareholder_equity
-                else None
-            )
+        # Align the other statements to the income-statement periods once;
+        # periods missing from a statement become all-NaN rows.
+        cashflow = cashflow.reindex(financials.index)
+        balance = balance.reindex(financials.index)
 
+        fin = _numeric_frame(financials, ["Total Revenue", "Net Income", "Gross Profit", "Operating Income"])
+        cf = _numeric_frame(cashflow, ["Operating Cash Flow", "Free Cash Flow"])
+        bs = _numeric_frame(
+            balance,
+            ["Total Assets", "Total Debt", "Stockholders Equity", "Current Assets", "Current Liabilities"],
+        )
+        revenue = fin["Total Revenue"]
+        net_income = fin["Net Income"]
+        total_debt = bs["Total Debt"]
+        equity = bs["Stockholders Equity"]
+
+        def div(num: pd.Series, den: pd.Series) -> pd.Series:
+            # Only an exactly zero denominator is treated as undefined here.
+            return num / den.where(den != 0)
+
+        values = pd.DataFrame(
+            {
+                "revenue": revenue,
+                "net_income": net_income,
+                "operating_cash_flow": cf["Operating Cash Flow"],
+                "free_cash_flow": cf["Free Cash Flow"],
+                "total_assets": bs["Total Assets"],
+                "total_debt": total_debt,
+                "shareholder_equity": equity,
+                "gross_margin": div(fin["Gross Profit"], revenue),
+                "operating_margin": div(fin["Operating Income"], revenue),
+                "net_margin": div(net_income, revenue),
+                "roe": div(net_income, equity),
+                "debt_to_equity": div(total_debt, equity),
+                "current_ratio": div(bs["Current Assets"], bs["Current Liabilities"]),
+            }
+        )
+        period_ends = pd.to_datetime(financials.index).strftime("%Y-%m-%d")
+
+        records: list[dict[str, Any]] = []
+        for period_end, row_values, fin_raw, cf_raw, bs_raw in zip(
+            period_ends,
+            _records_with_none(values),
+            _non_null_records(financials),
+            _non_null_records(cashflow),
+            _non_null_records(balance),
+        ):
             records.append(
                 {
                     "ticker": ticker,
                     "period_end": period_end,
                     "period_type": "annual",
-                    "revenue": _to_float(revenue),
-                    "net_income": _to_float(net_income),
-                    "operating_cash_flow": _to_float(operating_cash_flow),
-                    "free_cash_flow": _to_float(free_cash_flow),
-                    "total_assets": _to_float(total_assets),
-                    "total_debt": _to_float(total_debt),
-                    "shareholder_equity": _to_float(shareholder_equity),
-                    "gross_margin": gross_margin,
-                    "operating_margin": operating_margin,
-                    "net_margin": net_margin,
-                    "roe": roe,
-                    "debt_to_equity": debt_to_equity,
-                    "current_ratio": current_ratio,
+                    **row_values,
                     "raw_payload": {
-                        "financials": _json_safe_dict(row.dropna().to_dict()),
-                        "cashflow": _json_safe_dict(cf.dropna().to_dict()) if not cf.empty else {},
-                        "balance": _json_safe_dict(bs.dropna().to_dict()) if not bs.empty else {},
+                        "financials": _json_safe_dict(fin_raw),
+                        "cashflow": _json_safe_dict(cf_raw),
+                        "balance": _json_safe_dict(bs_raw),
                     },
                 }
             )
@@ -158,15 +239,45 @@ class YFinanceFetcher:
 
 
 class FMPFetcher:
-    def __init__(self, config: FMPConfig) -> None:
+    def __init__(self, config: FMPConfig, cache: FileCache | None = None) -> None:
+        # requests (with urllib3, idna, certifi) is imported here rather than
+        # at module level so the CLI's screen/backtest commands skip its
+        # ~70ms import.
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         self.config = config
+        self.cache = cache
+        # One pooled session keeps connections alive across statement
+        # requests instead of a new TCP/TLS handshake per call. Transient
+        # failures are retried with backoff; the last response is returned
+        # so raise_for_status still reports the HTTP error.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
     def _get(self, endpoint: str, **params: Any) -> Any:
-        params["apikey"] = self.config.api_key
+        # The API key is left out of the cache key so rotating it keeps the cache.
+        if self.cache is not None:
+            cached = self.cache.get("fmp", self.config.base_url, endpoint, params)
+            if cached is not None:
+                return cached
+
         url = f"{self.config.base_url}/{endpoint}"
-        response = requests.get(url, params=params, timeout=30)
+        response = self._session.get(url, params={**params, "apikey": self.config.api_key}, timeout=30)
         response.raise_for_status()
-        return response.json()
+        payload = response.json()
+        if self.cache is not None and payload:
+            self.cache.set(payload, "fmp", self.config.base_url, endpoint, params)
+        return payload
 
     def fetch_company_profile(self, ticker: str) -> dict[str, Any]:
         payload = self._get(f"profile/{ticker}")
@@ -193,9 +304,15 @@ class FMPFetcher:
         return pd.DataFrame(data)
 
     def fetch_fundamentals(self, ticker: str, limit: int = 20) -> list[dict[str, Any]]:
-        income = self.fetch_income_statement(ticker, limit=limit)
-        balance = self.fetch_balance_sheet(ticker, limit=limit)
-        cash = self.fetch_cashflow_statement(ticker, limit=limit)
+        # The three statement requests are independent and I/O-bound, so
+        # issue them concurrently rather than back to back.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            income_future = pool.submit(self.fetch_income_statement, ticker, limit=limit)
+            balance_future = pool.submit(self.fetch_balance_sheet, ticker, limit=limit)
+            cash_future = pool.submit(self.fetch_cashflow_statement, ticker, limit=limit)
+            income = income_future.result()
+            balance = balance_future.result()
+            cash = cash_future.result()
 
         if income.empty:
             return []
@@ -212,46 +329,92 @@ class FMPFetcher:
             suffixes=("", "_cash"),
         )
 
-        rows: list[dict[str, Any]] = []
-        for _, row in merged.iterrows():
-            revenue = row.get("revenue")
-            net_income = row.get("netIncome")
-            gross_profit = row.get("grossProfit")
-            operating_income = row.get("operatingIncome")
-            op_cf = row.get("operatingCashFlow")
-            fcf = row.get("freeCashFlow")
-            equity = row.get("totalStockholdersEquity")
-            total_debt = row.get("totalDebt")
-            current_assets = row.get("totalCurrentAssets")
-            current_liabilities = row.get("totalCurrentLiabilities")
+        # Coerce and divide whole columns; NaN (missing input or ~0
+        # denominator) becomes None in the emitted records.
+        num = _numeric_frame(merged, FMP_NUMERIC_FIELDS)
+        revenue = num["revenue"]
+        net_income = num["netIncome"]
+        equity = num["totalStockholdersEquity"]
+        total_debt = num["totalDebt"]
+        values = pd.DataFrame(
+            {
+                "revenue": revenue,
+                "net_income": net_income,
+                "operating_cash_flow": num["operatingCashFlow"],
+                "free_cash_flow": num["freeCashFlow"],
+                "total_assets": num["totalAssets"],
+                "total_debt": total_debt,
+                "shareholder_equity": equity,
+                "eps": num["eps"],
+                "gross_margin": _ratio_series(num["grossProfit"], revenue),
+                "operating_margin": _ratio_series(num["operatingIncome"], revenue),
+                "net_margin": _ratio_series(net_income, revenue),
+                "roe": _ratio_series(net_income, equity),
+                "debt_to_equity": _ratio_series(total_debt, equity),
+                "current_ratio": _ratio_series(num["totalCurrentAssets"], num["totalCurrentLiabilities"]),
+            }
+        )
 
+        rows: list[dict[str, Any]] = []
+        for raw, row_values in zip(merged.to_dict(orient="records"), _records_with_none(values)):
             rows.append(
                 {
                     "ticker": ticker,
-                    "period_end": row.get("date"),
-                    "period_type": "annual" if row.get("period") == "FY" else "quarterly",
-                    "currency": row.get("reportedCurrency"),
-                    "revenue": _to_float(revenue),
-                    "net_income": _to_float(net_income),
-                    "operating_cash_flow": _to_float(op_cf),
-                    "free_cash_flow": _to_float(fcf),
-                    "total_assets": _to_float(row.get("totalAssets")),
-                    "total_debt": _to_float(total_debt),
-                    "shareholder_equity": _to_float(equity),
-                    "eps": _to_float(row.get("eps")),
-                    "gross_margin": _ratio(gross_profit, revenue),
-                    "operating_margin": _ratio(operating_income, revenue),
-                    "net_margin": _ratio(net_income, revenue),
-                    "roe": _ratio(net_income, equity),
-                    "debt_to_equity": _ratio(total_debt, equity),
-                    "current_ratio": _ratio(current_assets, current_liabilities),
-                    "raw_payload": _json_safe_dict(row.to_dict()),
+                    "period_end": raw.get("date"),
+                    "period_type": "annual" if raw.get("period") == "FY" else "quarterly",
+                    "currency": raw.get("reportedCurrency"),
+                    **row_values,
+                    "raw_payload": _json_safe_dict(raw),
                 }
             )
 
         return rows
 
 
+def _price_frame(data: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """Normalize one ticker's ``yf.download`` frame to the stock_prices columns."""
+    if data.empty:
+        return pd.DataFrame(columns=["ticker", "date", "open", "high", "low", "close", "adj_close", "volume"])
+
+    # yfinance may return MultiIndex columns depending on version/options.
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = [
+            str(col[0]) if isinstance(col, tuple) else str(col)
+            for col in data.columns.to_flat_index()
+        ]
+
+    data = data.reset_index()
+    # "Adj Close" / "adj close" / "Adj_Close" all normalize to adj_close.
+    data.columns = (
+        data.columns.astype(str).str.strip().str.lower().str.replace(" ", "_").rename(None)
+    )
+
+    # Ensure expected columns exist so downstream insert is stable.
+    for col in ["open", "high", "low", "close", "adj_close", "volume"]:
+        if col not in data.columns:
+            data[col] = None
+
+    if "date" not in data.columns:
+        raise ValueError(f"Could not parse date column for ticker={ticker}")
+
+    data["ticker"] = ticker
+    data["date"] = _iso_dates(data["date"])
+    cols = ["ticker", "date", "open", "high", "low", "close", "adj_close", "volume"]
+    return data[cols].dropna(subset=["ticker", "date"])
+
+
+def _iso_dates(values: pd.Series) -> pd.Series:
+    """Format dates as ``YYYY-MM-DD`` strings without building ``datetime.date`` objects.
+
+    Timezone-aware values keep their local calendar date; NaT becomes missing.
+    """
+    dates = pd.to_datetime(values)
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    days = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    return pd.Series(np.datetime_as_string(days), index=dates.index).where(dates.notna())
+
+
 def _json_safe_dict(d: dict[Any, Any]) -> dict[str, Any]:
     """Convert dict keys/values to JSON-serializable types."""
     result: dict[str, Any] = {}
@@ -272,20 +435,24 @@ def _json_safe_dict(d: dict[Any, Any]) -> dict[str, Any]:
     return result
 
 
-def _to_float(value: Any) -> float | None:
-    if value is None:
-        return None
-    try:
-        if pd.isna(value):
-            return None
-        return float(value)
-    except (TypeError, ValueError):
-        return None
+def _non_null_records(df: pd.DataFrame) -> list[dict[Any, Any]]:
+    """One dict per row holding only that row's non-null cells."""
+    mask = df.notna().to_numpy(dtype=bool)
+    cells = df.to_numpy(dtype=object)
+    columns = df.columns.to_numpy(dtype=object)
+    return [dict(zip(columns[keep], row[keep])) for keep, row in zip(mask, cells)]
+
+
+def _numeric_frame(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """``columns`` of ``df`` as float64; unparseable values and absent columns are NaN."""
+    return df.reindex(columns=columns).apply(pd.to_numeric, errors="coerce").astype("float64")
+
+
+def _records_with_none(values: pd.DataFrame) -> list[dict[str, Any]]:
+    """Rows of a float frame as dicts of Python floats, with None for NaN."""
+    return values.astype(object).where(values.notna(), None).to_dict(orient="records")
 
 
-def _ratio(numerator: Any, denominator: Any) -> float | None:
-    num = _to_float(numerator)
-    den = _to_float(denominator)
-    if num is None or den is None or abs(den) < 1e-12:
-        return None
-    return num / den
+def _ratio_series(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """Elementwise ratio, NaN where either side is missing or the denominator is ~0."""
+    return numerator / denominator.where(denominator.abs() >= 1e-12)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import math
 from typing import Any
 
 import numpy as np
 import pandas as pd
+from numpy.typing import DTypeLike
+
+from ._compat import HAS_NUMBA, njit, prange
 
 
 def safe_div(numerator: float | None, denominator: float | None) -> float | None:
@@ -22,6 +26,18 @@ def pct_change(current: float | None, previous: float | None) -> float | None:
     return (current - previous) / abs(previous)
 
 
+def safe_div_nan(numerator: float | None, denominator: float | None) -> float:
+    """``safe_div`` with NaN instead of None, for results bound for float arrays."""
+    result = safe_div(numerator, denominator)
+    return math.nan if result is None else result
+
+
+def pct_change_nan(current: float | None, previous: float | None) -> float:
+    """``pct_change`` with NaN instead of None, for results bound for float arrays."""
+    result = pct_change(current, previous)
+    return math.nan if result is None else result
+
+
 def compute_metrics(current: dict[str, Any], previous: dict[str, Any] | None = None) -> dict[str, float | None]:
     previous = previous or {}
 
@@ -62,26 +78,266 @@ def compute_metrics(current: dict[str, Any], previous: dict[str, Any] | None = N
     return metrics
 
 
+# Keys returned by compute_metrics, in order; also the compute_metrics_df columns.
+METRIC_COLUMNS = [
+    "revenue_growth_1y",
+    "earnings_growth_1y",
+    "operating_cash_flow_growth_1y",
+    "gross_margin",
+    "operating_margin",
+    "net_margin",
+    "roe",
+    "debt_to_equity",
+    "asset_turnover",
+    "free_cash_flow",
+    "pe_ratio",
+    "ps_ratio",
+    "current_ratio",
+    "eps_growth_1y",
+]
+
+
+def _float_column(df: pd.DataFrame | None, col: str, n: int) -> np.ndarray:
+    if df is None or col not in df.columns:
+        return np.full(n, np.nan)
+    return df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+@njit(cache=True)
+def _safe_div_loop(numerator: np.ndarray, denominator: np.ndarray, out: np.ndarray) -> None:
+    for i in range(out.shape[0]):
+        d = denominator[i]
+        out[i] = np.nan if abs(d) < 1e-12 else numerator[i] / d
+
+
+@njit(cache=True)
+def _pct_change_loop(current: np.ndarray, previous: np.ndarray, out: np.ndarray) -> None:
+    for i in range(out.shape[0]):
+        p = abs(previous[i])
+        out[i] = np.nan if p < 1e-12 else (current[i] - previous[i]) / p
+
+
+def safe_div_array(
+    numerator: np.ndarray,
+    denominator: np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Elementwise ``safe_div`` over float arrays, with NaN in place of None.
+
+    Results are written into ``out`` when given.
+    """
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    if out is None:
+        out = np.empty(numerator.shape[0])
+    if HAS_NUMBA:
+        _safe_div_loop(numerator, denominator, out)
+        return out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(numerator, denominator, out=out)
+    np.copyto(out, np.nan, where=np.abs(denominator) < 1e-12)
+    return out
+
+
+def pct_change_array(
+    current: np.ndarray,
+    previous: np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Elementwise ``pct_change`` over float arrays, with NaN in place of None.
+
+    Results are written into ``out`` when given.
+    """
+    current = np.asarray(current, dtype=np.float64)
+    previous = np.asarray(previous, dtype=np.float64)
+    if out is None:
+        out = np.empty(current.shape[0])
+    if HAS_NUMBA:
+        _pct_change_loop(current, previous, out)
+        return out
+    base = np.abs(previous)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(current - previous, base, out=out)
+    np.copyto(out, np.nan, where=base < 1e-12)
+    return out
+
+
+def compute_metrics_df(
+    current: pd.DataFrame,
+    previous: pd.DataFrame | None = None,
+    dtype: DTypeLike = np.float64,
+    dtype_backend: str | None = None,
+) -> pd.DataFrame:
+    """Batch form of ``compute_metrics`` over aligned rows of two frames.
+
+    Row ``i`` of ``previous`` is the prior period for row ``i`` of
+    ``current``. Results follow ``compute_metrics`` with NaN in place of
+    None; a NaN ``pe_ratio`` falls back to price / eps.
+
+    Metrics are computed in float64 and stored as ``dtype``. ``np.float32``
+    halves the frame's memory and keeps about 7 significant digits, far
+    finer than any screening threshold. ``dtype_backend="pyarrow"`` returns
+    Arrow-backed columns (requires pyarrow), with missing metrics as nulls,
+    for pipelines that stay in Arrow.
+    """
+    if dtype_backend not in (None, "pyarrow"):
+        raise ValueError(f"Unsupported dtype_backend: {dtype_backend}")
+    n = len(current)
+    if previous is not None and len(previous) != n:
+        raise ValueError("previous must have one row per row of current")
+
+    def cur(col: str) -> np.ndarray:
+        return _float_column(current, col, n)
+
+    def prev(col: str) -> np.ndarray:
+        return _float_column(previous, col, n)
+
+    revenue = cur("revenue")
+    net_income = cur("net_income")
+    shareholder_equity = cur("shareholder_equity")
+
+    # Every metric is written straight into its row of one (metrics, rows)
+    # block, which becomes the frame's single float block without a copy.
+    block = np.empty((len(METRIC_COLUMNS), n), dtype=dtype)
+    out = dict(zip(METRIC_COLUMNS, block))
+    pct_change_array(revenue, prev("revenue"), out=out["revenue_growth_1y"])
+    pct_change_array(net_income, prev("net_income"), out=out["earnings_growth_1y"])
+    pct_change_array(
+        cur("operating_cash_flow"), prev("operating_cash_flow"), out=out["operating_cash_flow_growth_1y"]
+    )
+    safe_div_array(cur("gross_profit"), revenue, out=out["gross_margin"])
+    safe_div_array(cur("operating_income"), revenue, out=out["operating_margin"])
+    safe_div_array(net_income, revenue, out=out["net_margin"])
+    safe_div_array(net_income, shareholder_equity, out=out["roe"])
+    safe_div_array(cur("total_debt"), shareholder_equity, out=out["debt_to_equity"])
+    safe_div_array(revenue, cur("total_assets"), out=out["asset_turnover"])
+    out["free_cash_flow"][:] = cur("free_cash_flow")
+    pe_ratio = cur("pe_ratio")
+    out["pe_ratio"][:] = np.where(np.isnan(pe_ratio), safe_div_array(cur("price"), cur("eps")), pe_ratio)
+    safe_div_array(cur("market_cap"), revenue, out=out["ps_ratio"])
+    out["current_ratio"][:] = cur("current_ratio")
+    pct_change_array(cur("eps"), prev("eps"), out=out["eps_growth_1y"])
+    out_df = pd.DataFrame(block.T, index=current.index, columns=METRIC_COLUMNS, copy=False)
+    if dtype_backend == "pyarrow":
+        import pyarrow as pa
+
+        out_df = out_df.astype(pd.ArrowDtype(pa.from_numpy_dtype(block.dtype)))
+    return out_df
+
+
+def _sorted_by_ticker(financial_df: pd.DataFrame) -> pd.DataFrame:
+    # A categorical ticker is factorized once here (a no-op when the caller
+    # already passes one); the sort and the positional lags then work on its
+    # integer codes. sort_values returns a new frame, so later column
+    # assignments never touch the caller's data.
+    df = financial_df.assign(ticker=financial_df["ticker"].astype("category"))
+    return df.sort_values(["ticker", "period_end"])
+
+
+# (base column, output prefix) for add_growth_windows.
+GROWTH_BASES: list[tuple[str, str]] = [
+    ("revenue", "revenue_growth"),
+    ("net_income", "earnings_growth"),
+    ("eps", "eps_growth"),
+]
+GROWTH_YEARS = (1, 3, 5)
+
+
+@njit(parallel=True, cache=True)
+def _growth_ratio_kernel(values: np.ndarray, codes: np.ndarray, lags: np.ndarray) -> np.ndarray:
+    """Current / lagged ratios for every base column and lag in one pass.
+
+    Output row ``j * len(lags) + w`` holds column ``j`` of ``values`` over
+    ``lags[w]`` periods. Rows of ``values`` are sorted so each group code is
+    contiguous; row ``i - k`` is the same ticker's earlier period exactly
+    when its code matches. Code -1 (missing ticker) never matches, as
+    groupby drops those rows. A zero base gives NaN, and multi-period
+    ratios are kept only when positive. Rows are independent, so they run
+    in parallel, each reading its lagged rows while they are in cache.
+    """
+    n, m = values.shape
+    n_lags = lags.shape[0]
+    out = np.full((m * n_lags, n), np.nan)
+    for i in prange(n):
+        code = codes[i]
+        if code < 0:
+            continue
+        for w in range(n_lags):
+            k = lags[w]
+            if i < k or codes[i - k] != code:
+                continue
+            for j in range(m):
+                prev = values[i - k, j]
+                if prev == 0:
+                    continue
+                ratio = values[i, j] / prev
+                if k > 1 and not ratio > 0:
+                    continue
+                out[j * n_lags + w, i] = ratio
+    return out
+
+
+def _lag_in_group(codes: np.ndarray, lag: int) -> np.ndarray:
+    # For rows lag: of a frame sorted by group code, whether row i - lag
+    # belongs to the same (non-missing) group.
+    return (codes[lag:] == codes[:-lag]) & (codes[lag:] >= 0)
+
+
+def _growth_ratio_numpy(values: np.ndarray, codes: np.ndarray, lags: np.ndarray) -> np.ndarray:
+    # Same result as _growth_ratio_kernel, in whole-array passes for when
+    # Numba is unavailable and the row loop would run in the interpreter.
+    n, m = values.shape
+    out = np.full((m, len(lags), n), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for w, k in enumerate(lags):
+            if k >= n:
+                continue
+            prev = np.where(_lag_in_group(codes, k)[:, None], values[:-k], np.nan)
+            ratio = values[k:] / np.where(prev != 0, prev, np.nan)
+            if k > 1:
+                ratio = np.where(ratio > 0, ratio, np.nan)
+            out[:, w, k:] = ratio.T
+    return out.reshape(m * len(lags), n)
+
+
+def _add_growth_columns(df: pd.DataFrame) -> None:
+    # Lags are taken positionally on the ticker-sorted frame instead of via
+    # groupby shift, and every growth column is written in a single
+    # assignment. A zero lagged value gives NaN rather than inf, which would
+    # otherwise pass every "min growth" screen and poison correlations.
+    base_cols = [col for col, _ in GROWTH_BASES]
+    values = np.ascontiguousarray(df[base_cols].to_numpy(dtype=np.float64, na_value=np.nan))
+    codes = df["ticker"].cat.codes.to_numpy()
+    lags = np.array(GROWTH_YEARS, dtype=np.int64)
+    ratio_fn = _growth_ratio_kernel if HAS_NUMBA else _growth_ratio_numpy
+    growth = ratio_fn(values, codes, lags)
+
+    # Annualize multi-year ratios as CAGR with NumPy's vectorized power,
+    # which is several times faster than pow inside the kernel loop.
+    for w, years in enumerate(GROWTH_YEARS):
+        if years > 1:
+            rows = growth[w :: len(GROWTH_YEARS)]
+            growth[w :: len(GROWTH_YEARS)] = np.power(rows, 1.0 / years)
+    growth -= 1
+
+    names = [f"{prefix}_{years}y" for _, prefix in GROWTH_BASES for years in GROWTH_YEARS]
+    df[names] = pd.DataFrame(growth.T, index=df.index, columns=names, copy=False)
+
+
 def add_growth_windows(financial_df: pd.DataFrame) -> pd.DataFrame:
+    """Add 1y growth and 3y/5y CAGR columns per ticker, sorted by ticker and period.
+
+    ``period_end`` should be ISO date strings or datetimes so it sorts
+    chronologically. Factorizing a string ``ticker`` column is most of the
+    cost on large universes; callers that screen repeatedly can pass it as
+    ``category`` once, and the output keeps the input's ticker dtype.
+    """
     if financial_df.empty:
         return financial_df.copy()
 
-    df = financial_df.copy()
-    df = df.sort_values(["ticker", "period_end"])
-
-    for base_col, prefix in [
-        ("revenue", "revenue_growth"),
-        ("net_income", "earnings_growth"),
-        ("eps", "eps_growth"),
-    ]:
-        df[f"{prefix}_1y"] = df.groupby("ticker")[base_col].pct_change(periods=1)
-        # Annualize multi-year growth rates as CAGR: (current/previous)^(1/years) - 1
-        for years in [3, 5]:
-            total_growth = df.groupby("ticker")[base_col].pct_change(periods=years)
-            # Only annualize when the growth ratio (1 + total) is positive
-            ratio = 1 + total_growth
-            df[f"{prefix}_{years}y"] = ratio.where(ratio > 0).pow(1.0 / years) - 1
-
+    df = _sorted_by_ticker(financial_df)
+    _add_growth_columns(df)
+    df["ticker"] = df["ticker"].astype(financial_df["ticker"].dtype)
     return df
 
 
@@ -89,27 +345,56 @@ def add_revenue_acceleration(financial_df: pd.DataFrame) -> pd.DataFrame:
     if financial_df.empty:
         return financial_df.copy()
 
-    df = financial_df.copy()
+    df = _sorted_by_ticker(financial_df)
     if "revenue_growth_1y" not in df.columns:
-        df = add_growth_windows(df)
+        _add_growth_columns(df)
 
-    df = df.sort_values(["ticker", "period_end"])
-    df["revenue_acceleration"] = df.groupby("ticker")["revenue_growth_1y"].diff()
+    # Within-ticker diff taken positionally on the sorted frame, like the
+    # growth lags.
+    growth = df["revenue_growth_1y"].to_numpy(dtype=np.float64, na_value=np.nan)
+    acceleration = np.full(len(growth), np.nan)
+    if len(growth) > 1:
+        same = _lag_in_group(df["ticker"].cat.codes.to_numpy(), 1)
+        acceleration[1:] = np.where(same, growth[1:] - growth[:-1], np.nan)
+    df["revenue_acceleration"] = acceleration
+    df["ticker"] = df["ticker"].astype(financial_df["ticker"].dtype)
     return df
 
 
+@njit(parallel=True, cache=True)
+def _pearson_columns(x: np.ndarray, y: np.ndarray, min_pairs: int) -> np.ndarray:
+    """Pairwise-complete Pearson correlation of each column of ``x`` with ``y``.
+
+    Rows where either value is NaN are dropped per column; columns with
+    fewer than ``min_pairs`` complete rows or zero variance get NaN.
+    Columns are independent, so they run in parallel.
+    """
+    out = np.full(x.shape[1], np.nan)
+    y_ok = y == y
+    for j in prange(x.shape[1]):
+        col = x[:, j]
+        ok = y_ok & (col == col)
+        if ok.sum() < min_pairs:
+            continue
+        xs = col[ok]
+        ys = y[ok]
+        dx = xs - xs.mean()
+        dy = ys - ys.mean()
+        denom = np.sqrt((dx * dx).sum() * (dy * dy).sum())
+        if denom > 0:
+            out[j] = (dx * dy).sum() / denom
+    return out
+
+
 def correlation_with_returns(df: pd.DataFrame, return_col: str = "return_pct") -> pd.DataFrame:
     if df.empty or return_col not in df.columns:
         return pd.DataFrame(columns=["metric", "correlation"])
 
     numeric_cols = [c for c in df.select_dtypes(include=[np.number]).columns if c != return_col]
-    rows = []
-    for col in numeric_cols:
-        valid = df[[col, return_col]].dropna()
-        if len(valid) < 3:
-            corr = np.nan
-        else:
-            corr = valid[col].corr(valid[return_col])
-        rows.append({"metric": col, "correlation": corr})
-
-    return pd.DataFrame(rows).sort_values("correlation", ascending=False)
+    metrics = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    returns = df[return_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    # Fewer than 3 pairs is too few to report.
+    corrs = _pearson_columns(metrics, returns, 3)
+
+    out = pd.DataFrame({"metric": numeric_cols, "correlation": corrs})
+    return out.sort_values("correlation", ascending=False)
@@ -0,0 +1,32 @@
+"""Polars versions of the metrics transforms; requires the optional ``polars`` package."""
+
+from __future__ import annotations
+
+import polars as pl
+
+from .metrics import GROWTH_BASES, GROWTH_YEARS
+
+
+def add_growth_windows_polars(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Lazy equivalent of ``metrics.add_growth_windows``.
+
+    Lags are taken within each ticker with ``over``, so Polars can fuse the
+    shifts and ratios and run tickers in parallel. Pandas callers can wrap a
+    frame with ``pl.from_pandas(df).lazy()`` and collect the result.
+    """
+    # pandas leaves rows without a ticker out of every group, so their
+    # growth is null rather than lagged against each other.
+    has_ticker = pl.col("ticker").is_not_null()
+    growth = []
+    for base_col, prefix in GROWTH_BASES:
+        values = pl.col(base_col).cast(pl.Float64)
+        for years in GROWTH_YEARS:
+            prev = values.shift(years).over("ticker")
+            # A zero base gives null rather than inf.
+            ratio = values / pl.when(prev != 0).then(prev)
+            if years > 1:
+                # Annualize as CAGR, only when the growth ratio is positive.
+                ratio = pl.when(ratio > 0).then(ratio.pow(1.0 / years))
+            growth.append(pl.when(has_ticker).then(ratio - 1).alias(f"{prefix}_{years}y"))
+
+    return lf.sort(["ticker", "period_end"], nulls_last=True).with_columns(growth)
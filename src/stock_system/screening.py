@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import functools
+import operator
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 
@@ -17,48 +21,57 @@ class ScreeningCriteria:
     min_score: int = 5
 
 
-def _meets(metric_value: float | None, op: str, threshold: float) -> bool:
-    if metric_value is None or pd.isna(metric_value):
-        return False
-    if op == ">":
-        return metric_value > threshold
-    if op == ">=":
-        return metric_value >= threshold
-    if op == "<":
-        return metric_value < threshold
-    if op == "<=":
-        return metric_value <= threshold
-    raise ValueError(f"Unsupported operator: {op}")
+# (metric, operator, ScreeningCriteria threshold field), in reporting order.
+SCREEN_CHECKS: list[tuple[str, str, str]] = [
+    ("revenue_growth_1y", ">", "min_revenue_growth_1y"),
+    ("earnings_growth_1y", ">", "min_earnings_growth_1y"),
+    ("net_margin", ">", "min_profit_margin"),
+    ("pe_ratio", "<", "max_pe_ratio"),
+    ("debt_to_equity", "<", "max_debt_to_equity"),
+    ("free_cash_flow", ">", "min_free_cash_flow"),
+]
 
 
-def score_metrics(metrics: dict[str, Any], criteria: ScreeningCriteria) -> tuple[int, list[str]]:
-    checks = {
-        "revenue_growth_1y": (
-            metrics.get("revenue_growth_1y"),
-            ">",
-            criteria.min_revenue_growth_1y,
-        ),
-        "earnings_growth_1y": (
-            metrics.get("earnings_growth_1y"),
-            ">",
-            criteria.min_earnings_growth_1y,
-        ),
-        "net_margin": (metrics.get("net_margin"), ">", criteria.min_profit_margin),
-        "pe_ratio": (metrics.get("pe_ratio"), "<", criteria.max_pe_ratio),
-        "debt_to_equity": (
-            metrics.get("debt_to_equity"),
-            "<",
-            criteria.max_debt_to_equity,
-        ),
-        "free_cash_flow": (
-            metrics.get("free_cash_flow"),
-            ">",
-            criteria.min_free_cash_flow,
-        ),
-    }
+_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_checks(thresholds: tuple[float, ...]) -> Callable[[dict[str, Any]], tuple[int, list[str]]]:
+    checks = []
+    for (name, op, _), threshold in zip(SCREEN_CHECKS, thresholds):
+        fn = _OPS.get(op)
+        if fn is None:
+            raise ValueError(f"Unsupported operator: {op}")
+        checks.append((name, fn, threshold))
+
+    def screener(metrics: dict[str, Any]) -> tuple[int, list[str]]:
+        met = []
+        get = metrics.get
+        for name, fn, threshold in checks:
+            v = get(name)
+            if v is not None and not pd.isna(v) and fn(v, threshold):
+                met.append(name)
+        return len(met), met
+
+    return screener
 
-    met = [name for name, (val, op, threshold) in checks.items() if _meets(val, op, threshold)]
-    return len(met), met
+
+def compile_screener(criteria: ScreeningCriteria) -> Callable[[dict[str, Any]], tuple[int, list[str]]]:
+    """Return a ``score_metrics`` equivalent with ``criteria``'s thresholds bound.
+
+    Screeners are cached per threshold tuple, so repeated calls with equal
+    criteria reuse the same function.
+    """
+    return _compile_checks(tuple(getattr(criteria, attr) for _, _, attr in SCREEN_CHECKS))
+
+
+def score_metrics(metrics: dict[str, Any], criteria: ScreeningCriteria) -> tuple[int, list[str]]:
+    return compile_screener(criteria)(metrics)
 
 
 def screen_stock(
@@ -79,6 +92,42 @@ def screen_stock(
     }
 
 
+def _criteria_matrix(metrics_df: pd.DataFrame, criteria: ScreeningCriteria) -> np.ndarray:
+    # Column j holds SCREEN_CHECKS[j] for every row. Each criterion is one
+    # comparison over a whole column; NaN and missing metrics compare
+    # False, as in score_metrics.
+    passed = np.zeros((len(metrics_df), len(SCREEN_CHECKS)), dtype=bool)
+    for j, (name, op, attr) in enumerate(SCREEN_CHECKS):
+        if name not in metrics_df.columns:
+            continue
+        values = metrics_df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        passed[:, j] = _OPS[op](values, getattr(criteria, attr))
+    return passed
+
+
+def screen_stocks_df(
+    metrics_df: pd.DataFrame,
+    criteria: ScreeningCriteria | None = None,
+    date_col: str = "period_end",
+) -> pd.DataFrame:
+    """Score and screen every row of ``metrics_df`` in one columnar pass.
+
+    A lighter form of ``screen_universe`` that skips the per-row metrics
+    dicts and criteria_met lists; the result keeps ``metrics_df``'s index.
+    """
+    criteria = criteria or ScreeningCriteria()
+    score = _criteria_matrix(metrics_df, criteria).sum(axis=1)
+    return pd.DataFrame(
+        {
+            "ticker": metrics_df["ticker"],
+            date_col: metrics_df[date_col],
+            "score": score,
+            "passes_screen": score >= criteria.min_score,
+        },
+        index=metrics_df.index,
+    )
+
+
 def screen_universe(
     metrics_df: pd.DataFrame,
     date_col: str = "period_end",
@@ -90,25 +139,22 @@ def screen_universe(
             columns=["ticker", "date_screened", "score", "criteria_met", "passes_screen"]
         )
 
-    metric_cols = [
-        "revenue_growth_1y",
-        "earnings_growth_1y",
-        "net_margin",
-        "pe_ratio",
-        "debt_to_equity",
-        "free_cash_flow",
-    ]
-
-    rows = []
-    for _, row in metrics_df.iterrows():
-        metrics = {c: row.get(c) for c in metric_cols}
-        rows.append(
-            screen_stock(
-                ticker=row["ticker"],
-                date_screened=str(row[date_col]),
-                metrics=metrics,
-                criteria=criteria,
-            )
-        )
-
-    return pd.DataFrame(rows)
+    n = len(metrics_df)
+    passed = _criteria_matrix(metrics_df, criteria)
+    names = np.array([name for name, _, _ in SCREEN_CHECKS], dtype=object)
+    score = passed.sum(axis=1)
+    present = [c for c in names if c in metrics_df.columns]
+    missing = dict.fromkeys(names)
+    rows = metrics_df[present].to_dict(orient="records") if present else [{}] * n
+    metrics = [{**missing, **row} for row in rows]
+
+    return pd.DataFrame(
+        {
+            "ticker": metrics_df["ticker"].tolist(),
+            "date_screened": [str(v) for v in metrics_df[date_col].tolist()],
+            "metrics": metrics,
+            "score": score,
+            "criteria_met": [names[row].tolist() for row in passed],
+            "passes_screen": score >= criteria.min_score,
+        }
+    )
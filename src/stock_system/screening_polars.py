@@ -0,0 +1,42 @@
+"""Polars versions of the screening transforms; requires the optional ``polars`` package."""
+
+from __future__ import annotations
+
+import polars as pl
+
+from .screening import _OPS, SCREEN_CHECKS, ScreeningCriteria
+
+
+def screen_stocks_lazy(
+    lf: pl.LazyFrame,
+    criteria: ScreeningCriteria | None = None,
+    date_col: str = "period_end",
+) -> pl.LazyFrame:
+    """Lazy equivalent of ``screening.screen_stocks_df``.
+
+    Each criterion is a boolean expression summed into ``score``, so Polars
+    can fuse the comparisons and push filters on ``passes_screen`` down.
+    """
+    criteria = criteria or ScreeningCriteria()
+    schema = lf.collect_schema()
+    checks = []
+    for name, op, attr in SCREEN_CHECKS:
+        if name not in schema:
+            continue
+        value = pl.col(name)
+        # Polars orders NaN above every number and null compares to null, so
+        # both are excluded explicitly to fail the check as in pandas. Only
+        # float columns can hold NaN, and is_nan raises on the others.
+        present = value.is_not_null()
+        if schema[name].is_float():
+            present = present & value.is_not_nan()
+        passed = present & _OPS[op](value, getattr(criteria, attr))
+        checks.append(passed.fill_null(False).cast(pl.Int64))
+
+    score = pl.sum_horizontal(checks) if checks else pl.lit(0, dtype=pl.Int64)
+    return lf.select(
+        pl.col("ticker"),
+        pl.col(date_col),
+        score.alias("score"),
+        (score >= criteria.min_score).alias("passes_screen"),
+    )
@@ -0,0 +1,64 @@
+import multiprocessing as mp
+
+import numpy as np
+import pandas as pd
+
+from stock_system.analysis import create_core_plots, export_core_reports, metric_bucket_report
+
+
+def test_metric_bucket_report_matches_qcut_labels():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"pe_ratio": rng.normal(20, 7, 50), "return_pct": rng.normal(2, 10, 50)})
+    df.loc[[3, 17], "pe_ratio"] = np.nan
+
+    report = metric_bucket_report(df, "pe_ratio", buckets=4)
+
+    clean = df.dropna()
+    expected = pd.qcut(clean["pe_ratio"], q=4, duplicates="drop")
+    assert list(report["bucket"]) == list(expected.cat.categories)
+    grouped = clean.groupby(expected, observed=True)["return_pct"]
+    np.testing.assert_allclose(report["avg_return"], grouped.mean())
+    np.testing.assert_allclose(report["win_rate"], grouped.apply(lambda x: (x > 0).mean()))
+    assert report["count"].tolist() == grouped.count().tolist()
+
+
+def test_metric_bucket_report_constant_values():
+    df = pd.DataFrame({"pe_ratio": [5.0, 5.0, 5.0], "return_pct": [1.0, -2.0, 3.0]})
+
+    assert metric_bucket_report(df, "pe_ratio", buckets=3).empty
+    single = metric_bucket_report(df, "pe_ratio", buckets=1)
+    assert single["bucket"].astype(str).tolist() == ["(4.999, 5.0]"]
+    assert single["count"].tolist() == [3]
+
+
+def test_export_core_reports_keeps_storage_columns_out_of_correlation(tmp_path):
+    results = pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4],
+            "ticker": ["AAA", "BBB", "AAA", "CCC"],
+            "buy_date": ["2024-01-02", "2024-02-01", "2024-03-01", "2024-04-01"],
+            "sell_date": ["2024-04-01", "2024-05-01", "2024-06-03", "2024-07-01"],
+            "return_pct": [5.0, -2.0, 8.0, 1.0],
+            "pe_ratio": [12.0, 30.0, 10.0, 18.0],
+            "metrics_at_purchase": [f'{{"pe_ratio": {pe}}}' for pe in [12.0, 30.0, 10.0, 18.0]],
+            "created_at": ["2024-06-01 00:00:00"] * 4,
+        }
+    )
+
+    paths = export_core_reports(results, tmp_path)
+
+    exported = pd.read_csv(paths["backtest_results"])
+    assert list(exported.columns) == list(results.columns)
+    assert exported["metrics_at_purchase"].tolist() == results["metrics_at_purchase"].tolist()
+    assert pd.read_csv(paths["metric_correlation"])["metric"].tolist() == ["pe_ratio"]
+
+
+def test_create_core_plots_leaves_start_method_unset(tmp_path):
+    before = mp.get_start_method(allow_none=True)
+    results = pd.DataFrame({"return_pct": [5.0, -2.0, np.nan], "buy_date": ["2024-01-02", "2024-02-01", "2024-03-01"]})
+
+    paths = create_core_plots(results, tmp_path)
+
+    assert sorted(paths) == ["hist_return_distribution", "timeseries_cumulative_returns"]
+    assert all(path.exists() for path in paths.values())
+    assert mp.get_start_method(allow_none=True) == before
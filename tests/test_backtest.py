@@ -1,4 +1,5 @@
 import pandas as pd
+import pytest
 
 from stock_system.backtest import BacktestConfig, backtest_strategy, summarize_backtest
 
@@ -55,6 +56,26 @@ def test_summarize_backtest_values():
     assert round(summary["win_rate"], 4) == 0.6667
 
 
+def test_summarize_backtest_skips_nan_returns():
+    results = pd.DataFrame(
+        [
+            {"return_pct": 10.0, "buy_date": "2024-01-02", "sell_date": "2024-07-01"},
+            {"return_pct": float("nan"), "buy_date": "2024-02-01", "sell_date": "2024-07-30"},
+            {"return_pct": -5.0, "buy_date": "2024-03-01", "sell_date": "2024-08-28"},
+            {"return_pct": 8.0, "buy_date": "2024-04-01", "sell_date": "2024-09-27"},
+        ]
+    )
+    summary = summarize_backtest(results)
+    assert summary["num_trades"] == 4
+    assert summary["avg_return_pct"] == pytest.approx(13.0 / 3)
+    assert summary["win_rate"] == pytest.approx(0.5)
+    assert summary["best_trade_pct"] == 10.0
+    assert summary["worst_trade_pct"] == -5.0
+    assert summary["max_drawdown_pct"] == pytest.approx(-5.0)
+    assert summary["sharpe_ratio"] is not None
+    assert summary["cagr"] == pytest.approx((1.1 * 0.95 * 1.08) ** (365.25 / 269) - 1)
+
+
 def test_backtest_filing_delay():
     """Buy should be delayed by filing_delay_days after the signal date."""
     signals = pd.DataFrame(
@@ -139,3 +160,24 @@ def test_summarize_empty_results():
     assert summary["num_trades"] == 0
     assert summary["cagr"] is None
     assert summary["sharpe_ratio"] is None
+
+
+def test_backtest_reflects_updated_prices_between_calls():
+    signals = pd.DataFrame(
+        [
+            {"ticker": "AAA", "date_screened": "2024-01-02", "passes_screen": True},
+        ]
+    )
+    prices = pd.DataFrame(
+        [
+            {"ticker": "AAA", "date": "2024-01-02", "close": 100},
+            {"ticker": "AAA", "date": "2024-07-01", "close": 120},
+        ]
+    )
+    config = BacktestConfig(hold_days=180, transaction_cost_bps=0, filing_delay_days=0)
+
+    first = backtest_strategy(signals, prices, config)
+    prices.loc[1, "close"] = 130
+    second = backtest_strategy(signals, prices, config)
+    assert first.iloc[0]["sell_price"] == 120
+    assert second.iloc[0]["sell_price"] == 130
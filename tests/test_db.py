@@ -2,6 +2,7 @@ import json
 import tempfile
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
 from stock_system.db import Database
@@ -90,3 +91,53 @@ def test_foreign_key_enforcement(db):
         db.upsert_stock_prices([
             {"ticker": "NONEXISTENT", "date": "2024-01-02", "open": 100, "high": 105, "low": 99, "close": 103, "adj_close": 103, "volume": 1000},
         ])
+
+
+def test_bulk_commits_all_upserts_together(db):
+    with db.bulk():
+        db.upsert_companies([{"ticker": "AAPL", "name": "Apple", "sector": "Tech", "industry": "Hardware"}])
+        db.upsert_stock_prices([
+            {"ticker": "AAPL", "date": "2024-01-02", "close": 103},
+            {"ticker": "AAPL", "date": "2024-01-03", "close": 104},
+        ])
+        # Reads inside the block see the pending writes.
+        assert len(db.query_df("SELECT * FROM stock_prices")) == 2
+
+    result = db.query_df("SELECT * FROM stock_prices WHERE ticker = ?", ("AAPL",))
+    assert len(result) == 2
+
+
+def test_bulk_rolls_back_on_error(db):
+    with pytest.raises(RuntimeError):
+        with db.bulk():
+            db.upsert_companies([{"ticker": "AAPL", "name": "Apple", "sector": "Tech", "industry": "Hardware"}])
+            raise RuntimeError("boom")
+
+    assert db.query_df("SELECT * FROM companies").empty
+
+
+def test_backtest_price_query_uses_covering_index(db):
+    plan = db.query_df(
+        "EXPLAIN QUERY PLAN SELECT ticker, date, close FROM stock_prices WHERE ticker IN (?, ?)",
+        ("AAPL", "MSFT"),
+    )
+    assert plan["detail"].str.contains("COVERING INDEX idx_stock_prices_ticker_date_close").any()
+
+
+def test_upsert_stock_prices_df(db):
+    db.upsert_companies([{"ticker": "AAPL", "name": "Apple", "sector": "Tech", "industry": "Hardware"}])
+    prices = pd.DataFrame(
+        {
+            "ticker": ["AAPL", "AAPL", None],
+            "date": ["2024-01-02", "2024-01-03", "2024-01-04"],
+            "close": [103.0, float("nan"), 105.0],
+            "volume": [1000, 1100, 1200],
+        }
+    )
+    db.upsert_stock_prices_df(prices)
+    result = db.query_df("SELECT * FROM stock_prices ORDER BY date")
+    assert len(result) == 2
+    assert result.iloc[0]["close"] == 103
+    assert result.iloc[0]["volume"] == 1000
+    assert pd.isna(result.iloc[1]["close"])
+    assert result["market_cap"].isna().all()
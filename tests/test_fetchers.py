@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import types
+
+import pandas as pd
+import pytest
+
+from stock_system.fetchers import FileCache, YFinanceFetcher
+
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def _history(closes):
+    index = pd.DatetimeIndex(pd.date_range("2024-01-02", periods=len(closes), freq="D"), name="Date")
+    return pd.DataFrame({field: [float(c) for c in closes] for field in FIELDS}, index=index)
+
+
+class FakeTicker:
+    def __init__(self, symbol):
+        self.info = {"longName": f"{symbol} Inc."}
+        self.financials = self.cashflow = self.balance_sheet = pd.DataFrame()
+
+
+@pytest.fixture
+def fake_yf(monkeypatch):
+    """A stand-in ``yfinance`` module that records each download call."""
+    yf = types.ModuleType("yfinance")
+    yf.histories = {}
+    yf.calls = []
+
+    def download(tickers, start, end, auto_adjust, progress, group_by="column"):
+        yf.calls.append(tickers)
+        if isinstance(tickers, str):
+            return yf.histories.get(tickers, pd.DataFrame())
+        # Like yfinance, the batch frame labels its blocks with upper-case symbols.
+        frames = {t.upper(): yf.histories[t.upper()] for t in tickers if t.upper() in yf.histories}
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+    yf.download = download
+    yf.Ticker = FakeTicker
+    monkeypatch.setitem(sys.modules, "yfinance", yf)
+    return yf
+
+
+def test_file_cache_round_trip_and_ttl(tmp_path):
+    cache = FileCache(tmp_path, ttl_seconds=60)
+    assert cache.get("prices", "AAA") is None
+
+    cache.set({"close": [1.0, 2.0]}, "prices", "AAA")
+    assert cache.get("prices", "AAA") == {"close": [1.0, 2.0]}
+    assert cache.get("prices", "BBB") is None
+
+    path = next(tmp_path.glob("*.json"))
+    stale = time.time() - 120
+    os.utime(path, (stale, stale))
+    assert cache.get("prices", "AAA") is None
+
+
+def test_fetch_prices_many_downloads_only_uncached_tickers(fake_yf, tmp_path):
+    fake_yf.histories = {"AAA": _history([10, 11]), "BBB": _history([20, 21, 22]), "CCC": _history([30])}
+    fetcher = YFinanceFetcher(cache=FileCache(tmp_path))
+
+    first = fetcher.fetch_prices_many(["AAA", "BBB"], "2024-01-01", "2024-02-01")
+    assert fake_yf.calls == [["AAA", "BBB"]]
+    assert first["AAA"]["close"].tolist() == [10.0, 11.0]
+    assert first["BBB"]["date"].tolist() == ["2024-01-02", "2024-01-03", "2024-01-04"]
+
+    second = fetcher.fetch_prices_many(["AAA", "BBB", "CCC"], "2024-01-01", "2024-02-01")
+    assert fake_yf.calls == [["AAA", "BBB"], "CCC"]
+    pd.testing.assert_frame_equal(second["BBB"], first["BBB"].reset_index(drop=True), check_dtype=False)
+    assert second["CCC"]["close"].tolist() == [30.0]
+
+
+def test_empty_results_are_not_cached(fake_yf, tmp_path):
+    fetcher = YFinanceFetcher(cache=FileCache(tmp_path))
+
+    assert fetcher.fetch_prices("AAA", "2024-01-01", "2024-02-01").empty
+    assert fetcher.fetch_fundamentals("AAA") == []
+    assert list(tmp_path.glob("*.json")) == []
+
+    # Data that shows up later is fetched rather than masked by a cached miss.
+    fake_yf.histories["AAA"] = _history([10])
+    assert fetcher.fetch_prices("AAA", "2024-01-01", "2024-02-01")["close"].tolist() == [10.0]
+    assert fake_yf.calls == ["AAA", "AAA"]
+
+
+def test_fetch_prices_many_keeps_lowercase_tickers_in_batches(fake_yf):
+    fake_yf.histories = {"AAA": _history([10, 11]), "BBB": _history([20])}
+    fetcher = YFinanceFetcher()
+
+    prices = fetcher.fetch_prices_many(["aaa", "BBB"], "2024-01-01", "2024-02-01")
+    assert fake_yf.calls == [["AAA", "BBB"]]
+    assert prices["aaa"]["close"].tolist() == [10.0, 11.0]
+    assert prices["aaa"]["ticker"].unique().tolist() == ["aaa"]
+    assert prices["BBB"]["close"].tolist() == [20.0]
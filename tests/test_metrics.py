@@ -1,6 +1,21 @@
+import math
+
+import numpy as np
 import pandas as pd
+import pytest
 
-from stock_system.metrics import add_growth_windows, compute_metrics, pct_change, safe_div
+from stock_system.metrics import (
+    add_growth_windows,
+    compute_metrics,
+    compute_metrics_df,
+    correlation_with_returns,
+    pct_change,
+    pct_change_array,
+    pct_change_nan,
+    safe_div,
+    safe_div_array,
+    safe_div_nan,
+)
 
 
 def test_safe_div_and_pct_change():
@@ -8,6 +23,20 @@ def test_safe_div_and_pct_change():
     assert safe_div(10, 0) is None
     assert pct_change(120, 100) == 0.2
     assert pct_change(120, 0) is None
+    assert safe_div_nan(10, 2) == 5
+    assert math.isnan(safe_div_nan(10, 0))
+    assert pct_change_nan(120, 100) == 0.2
+    assert math.isnan(pct_change_nan(None, 100))
+
+
+def test_array_helpers_match_scalar_helpers():
+    a = [10.0, 5.0, -3.0, 1.0, float("nan")]
+    b = [2.0, 0.0, -4.0, 1e-13, 1.0]
+    # None from the scalar helpers becomes NaN in a float array.
+    expected_div = np.array([safe_div(x, y) for x, y in zip(a, b)], dtype=float)
+    expected_change = np.array([pct_change(x, y) for x, y in zip(a, b)], dtype=float)
+    np.testing.assert_array_equal(safe_div_array(np.array(a), np.array(b)), expected_div)
+    np.testing.assert_array_equal(pct_change_array(np.array(a), np.array(b)), expected_change)
 
 
 def test_compute_metrics_basic():
@@ -33,12 +62,12 @@ def test_compute_metrics_basic():
     }
     m = compute_metrics(current, previous)
 
-    assert round(m["revenue_growth_1y"], 4) == 0.2
-    assert round(m["earnings_growth_1y"], 4) == 0.2
-    assert round(m["net_margin"], 4) == 0.2
-    assert round(m["roe"], 4) == 0.3
-    assert round(m["debt_to_equity"], 4) == 0.5
-    assert round(m["pe_ratio"], 4) == 20.0
+    assert m["revenue_growth_1y"] == pytest.approx(0.2, abs=1e-4)
+    assert m["earnings_growth_1y"] == pytest.approx(0.2, abs=1e-4)
+    assert m["net_margin"] == pytest.approx(0.2, abs=1e-4)
+    assert m["roe"] == pytest.approx(0.3, abs=1e-4)
+    assert m["debt_to_equity"] == pytest.approx(0.5, abs=1e-4)
+    assert m["pe_ratio"] == pytest.approx(20.0, abs=1e-4)
 
 
 def test_add_growth_windows():
@@ -54,4 +83,92 @@ def test_add_growth_windows():
 
     out = add_growth_windows(df)
     aaa_2022 = out[(out["ticker"] == "AAA") & (out["period_end"] == "2022-12-31")].iloc[0]
-    assert round(aaa_2022["revenue_growth_1y"], 4) == 0.25
+    assert aaa_2022["revenue_growth_1y"] == pytest.approx(0.25, abs=1e-4)
+
+
+def test_add_growth_windows_keeps_categorical_ticker():
+    df = pd.DataFrame(
+        {
+            "ticker": ["BBB", "AAA", "AAA", "BBB"],
+            "period_end": ["2022-12-31", "2022-12-31", "2021-12-31", "2021-12-31"],
+            "revenue": [88.0, 120.0, 100.0, 80.0],
+            "net_income": [9.0, 12.0, 10.0, 8.0],
+            "eps": [0.9, 1.2, 1.0, 0.8],
+        }
+    )
+
+    out = add_growth_windows(df.astype({"ticker": "category"}))
+    expected = add_growth_windows(df)
+    assert isinstance(out["ticker"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(out.astype({"ticker": expected["ticker"].dtype}), expected)
+
+
+def test_add_growth_windows_zero_base_is_nan():
+    df = pd.DataFrame(
+        {
+            "ticker": ["AAA", "AAA"],
+            "period_end": ["2021-12-31", "2022-12-31"],
+            "revenue": [0.0, 50.0],
+            "net_income": [0.0, 0.0],
+            "eps": [0.0, 1.0],
+        }
+    )
+
+    latest = add_growth_windows(df).iloc[-1]
+    assert math.isnan(latest["revenue_growth_1y"])
+    assert math.isnan(latest["earnings_growth_1y"])
+    assert math.isnan(latest["eps_growth_1y"])
+
+
+def test_compute_metrics_df_matches_compute_metrics():
+    current = [
+        {"revenue": 120, "net_income": 24, "shareholder_equity": 80, "eps": 2.0, "price": 40},
+        {"revenue": 0, "net_income": 5, "shareholder_equity": None, "eps": 0.0, "pe_ratio": 15},
+    ]
+    previous = [{"revenue": 100, "net_income": 20}, {"revenue": 0, "net_income": -10}]
+
+    out = compute_metrics_df(pd.DataFrame(current), pd.DataFrame(previous))
+    for i, (cur, prev) in enumerate(zip(current, previous)):
+        expected = compute_metrics(cur, prev)
+        assert list(out.columns) == list(expected)
+        for key, value in expected.items():
+            got = out.iloc[i][key]
+            assert math.isnan(got) if value is None else got == pytest.approx(value, rel=1e-10)
+
+
+def test_correlation_with_returns_uses_complete_pairs():
+    df = pd.DataFrame(
+        {
+            "a": [1.0, 2.0, None, 4.0, 5.0],
+            "b": [None, None, 3.0, None, 1.0],
+            "return_pct": [0.1, 0.2, 0.3, 0.4, 0.6],
+        }
+    )
+    out = correlation_with_returns(df).set_index("metric")["correlation"]
+    expected = df["a"].corr(df["return_pct"])
+    assert math.isclose(out["a"], expected)
+    # Only two complete (b, return_pct) pairs.
+    assert math.isnan(out["b"])
+
+
+def test_compute_metrics_df_float32():
+    current = pd.DataFrame(
+        {"revenue": [120.0, 0.0], "net_income": [24.0, 5.0], "eps": [2.0, 1.0], "price": [40.0, 9.0]}
+    )
+    previous = pd.DataFrame({"revenue": [100.0, 50.0]})
+
+    out = compute_metrics_df(current, previous, dtype=np.float32)
+    expected = compute_metrics_df(current, previous)
+    assert (out.dtypes == np.float32).all()
+    np.testing.assert_allclose(out.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+
+def test_compute_metrics_df_pyarrow_backend():
+    pytest.importorskip("pyarrow")
+    current = pd.DataFrame({"revenue": [120.0, 0.0], "net_income": [24.0, 5.0]})
+
+    out = compute_metrics_df(current, dtype_backend="pyarrow")
+    expected = compute_metrics_df(current)
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in out.dtypes)
+    assert out["net_margin"].isna().tolist() == [False, True]
+    pd.testing.assert_frame_equal(out.astype("float64"), expected)
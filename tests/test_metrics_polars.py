@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from stock_system.metrics import add_growth_windows
+
+pl = pytest.importorskip("polars")
+
+from stock_system.metrics_polars import add_growth_windows_polars
+
+
+def test_add_growth_windows_polars_matches_pandas():
+    df = pd.DataFrame(
+        {
+            "ticker": ["BBB", "AAA", "AAA", "BBB", "AAA", "AAA"],
+            "period_end": ["2022-12-31", "2021-12-31", "2020-12-31", "2021-12-31", "2022-12-31", "2023-12-31"],
+            "revenue": [88.0, 120.0, 100.0, 80.0, 150.0, 0.0],
+            "net_income": [9.0, 12.0, 0.0, 8.0, 16.0, 5.0],
+            "eps": [0.9, 1.2, 1.0, 0.8, 1.5, -1.0],
+        }
+    )
+
+    expected = add_growth_windows(df).reset_index(drop=True)
+    out = add_growth_windows_polars(pl.from_pandas(df).lazy()).collect().to_pandas()
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False)
+
+
+def test_add_growth_windows_polars_leaves_null_tickers_ungrouped():
+    df = pd.DataFrame(
+        {
+            "ticker": ["AAA", None, None, "AAA", None],
+            "period_end": ["2020-12-31", "2020-12-31", "2021-12-31", "2021-12-31", "2022-12-31"],
+            "revenue": [100.0, 50.0, 60.0, 120.0, 90.0],
+            "net_income": [10.0, 5.0, 6.0, 12.0, 9.0],
+            "eps": [1.0, 0.5, 0.6, 1.2, 0.9],
+        }
+    )
+
+    expected = add_growth_windows(df).reset_index(drop=True)
+    out = add_growth_windows_polars(pl.from_pandas(df).lazy()).collect().to_pandas()
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False)
+    assert out.loc[out["ticker"].isna(), "revenue_growth_1y"].isna().all()
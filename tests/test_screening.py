@@ -1,4 +1,13 @@
-from stock_system.screening import ScreeningCriteria, screen_stock
+import numpy as np
+import pandas as pd
+
+from stock_system.screening import (
+    ScreeningCriteria,
+    compile_screener,
+    score_metrics,
+    screen_stock,
+    screen_stocks_df,
+)
 
 
 def test_screen_stock_passes_with_high_score():
@@ -29,3 +38,46 @@ def test_screen_stock_fails_when_insufficient_criteria():
     result = screen_stock("XYZ", "2024-01-31", metrics, criteria)
     assert result["score"] == 0
     assert result["passes_screen"] is False
+
+
+def test_score_metrics_ignores_missing_values():
+    metrics = {
+        "revenue_growth_1y": float("nan"),
+        "earnings_growth_1y": None,
+        "pe_ratio": 20,
+    }
+    score, met = score_metrics(metrics, ScreeningCriteria())
+    assert score == 1
+    assert met == ["pe_ratio"]
+
+
+def test_score_metrics_treats_pd_na_as_missing():
+    assert score_metrics({"pe_ratio": pd.NA}, ScreeningCriteria()) == (0, [])
+
+    metrics = {"pe_ratio": pd.NA, "net_margin": np.nan, "debt_to_equity": 0.5}
+    assert score_metrics(metrics, ScreeningCriteria()) == (1, ["debt_to_equity"])
+    result = screen_stock("AAA", "2024-01-31", metrics, ScreeningCriteria(min_score=1))
+    assert result["criteria_met"] == ["debt_to_equity"]
+    assert result["passes_screen"] is True
+
+
+def test_compile_screener_reuses_screener_for_equal_thresholds():
+    screener = compile_screener(ScreeningCriteria(min_score=5))
+    assert compile_screener(ScreeningCriteria(min_score=3)) is screener
+    assert compile_screener(ScreeningCriteria(max_pe_ratio=10.0)) is not screener
+    assert screener({"pe_ratio": 20, "net_margin": 0.2}) == (2, ["net_margin", "pe_ratio"])
+
+
+def test_screen_stocks_df_matches_screen_stock():
+    rows = [
+        {"revenue_growth_1y": 0.3, "earnings_growth_1y": 0.2, "net_margin": 0.15, "pe_ratio": 20},
+        {"revenue_growth_1y": None, "earnings_growth_1y": 0.2, "debt_to_equity": 3.0},
+    ]
+    df = pd.DataFrame(rows).assign(ticker=["AAA", "BBB"], period_end="2024-01-31")
+    criteria = ScreeningCriteria(min_score=4)
+
+    out = screen_stocks_df(df, criteria)
+    for row, (_, result) in zip(rows, out.iterrows()):
+        expected = screen_stock(result["ticker"], "2024-01-31", row, criteria)
+        assert result["score"] == expected["score"]
+        assert result["passes_screen"] == expected["passes_screen"]
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from stock_system.screening import ScreeningCriteria, screen_stocks_df
+
+pl = pytest.importorskip("polars")
+
+from stock_system.screening_polars import screen_stocks_lazy
+
+
+def test_screen_stocks_lazy_matches_screen_stocks_df():
+    df = pd.DataFrame(
+        {
+            "ticker": ["AAA", "BBB", "CCC"],
+            "period_end": ["2024-01-31"] * 3,
+            "revenue_growth_1y": [0.3, float("nan"), 0.1],
+            "earnings_growth_1y": [0.2, 0.5, None],
+            "net_margin": [0.15, 0.2, 0.01],
+            "pe_ratio": [20.0, 45.0, float("nan")],
+            "free_cash_flow": [1000.0, -5.0, 10.0],
+        }
+    )
+    criteria = ScreeningCriteria(min_score=3)
+
+    expected = screen_stocks_df(df, criteria).reset_index(drop=True)
+    out = screen_stocks_lazy(pl.from_pandas(df, nan_to_null=False).lazy(), criteria).collect().to_pandas()
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False)
+
+
+def test_screen_stocks_lazy_accepts_integer_metric_columns():
+    df = pd.DataFrame(
+        {
+            "ticker": ["AAA", "BBB", "CCC"],
+            "period_end": ["2024-01-31"] * 3,
+            "net_margin": [0.15, float("nan"), 0.01],
+            "free_cash_flow": pd.array([1000, -5, None], dtype="Int64"),
+        }
+    )
+    criteria = ScreeningCriteria(min_score=1)
+
+    expected = screen_stocks_df(df, criteria).reset_index(drop=True)
+    lf = pl.from_pandas(df, nan_to_null=False).lazy()
+    assert lf.collect_schema()["free_cash_flow"] == pl.Int64
+    out = screen_stocks_lazy(lf, criteria).collect().to_pandas()
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False)
+    assert out["score"].tolist() == [2, 0, 0]